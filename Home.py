@@ -1,10 +1,8 @@
 import streamlit as st
-from PIL import Image
 
 st.set_page_config(page_title='Home', page_icon='🎲')
 
-image = Image.open('logo.jpg')
-st.sidebar.image(image, width=120)
+st.sidebar.image('logo.jpg', width=120)
 
 st.sidebar.markdown('# Curry company')
 st.sidebar.markdown('## Fastest delivery in Town.')
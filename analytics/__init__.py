@@ -0,0 +1,4 @@
+"""
+    Pacote com as rotinas de carga, limpeza e análise dos dados da Curry company,
+    compartilhadas pelas páginas do dashboard.
+"""
@@ -0,0 +1,134 @@
+# ==========================
+#         Import's
+# ==========================
+
+import pandas as pd
+
+from analytics.cube import count_orders, plain_keys
+
+# ==========================
+#        Function's
+# ==========================
+
+# Tabelas das páginas, sem dependência de streamlit ou plotly: podem ser usadas
+# em jobs batch e benchmarks. As funções de visão empresa recebem o cubo diário
+# já filtrado; as demais recebem o dataframe de pedidos já filtrado.
+
+def order_metric(cube):
+    """
+        Esta função tem a responsabilidade de realizar a contagem de pedidos por dia.
+    """
+    return count_orders(cube, 'Order_Date')
+
+def traffic_order_share(cube):
+    """
+        Esta função tem a responsabilidade de somar a distribuição de pedidos por tipo de tráfego.
+    """
+    df_aux = count_orders(cube, 'Road_traffic_density')
+    df_aux['deliveries_perc'] = df_aux['orders'] / df_aux['orders'].sum()
+
+    return df_aux
+
+def traffic_order_city(cube):
+    """
+        Está função tem a responsabilidade de fazer comparação do volume de pedidos por cidade e tipo de trafego.
+    """
+    return count_orders(cube, ['City', 'Road_traffic_density'])
+
+def order_by_week(cube):
+    """
+        Esta função tem a responsabilidade de realizar a contagem de pedidos por semana.
+    """
+    return count_orders(cube, 'week_of_year')
+
+def order_share_by_week(cube, df_couriers):
+    """
+        Esta função tem a responsabilidade de realizar a contagem de pedidos por entregador e semana.
+        Os pedidos vêm do cubo e os entregadores únicos por semana dos sketches
+        (ou do nunique, no modo exato).
+    """
+    df_aux = pd.merge(order_by_week(cube), plain_keys(df_couriers), how='inner')
+    df_aux['order_by_deliver'] = df_aux['orders'] / df_aux['Delivery_person_ID']
+
+    return df_aux
+
+def metric_values(metrics):
+    """
+        Esta função tem a responsabilidade de preparar os valores dos cards para o
+        st.metric: inteiros, ou None (exibido como '—') quando o recorte é vazio.
+        Usada por todos os motores.
+    """
+    return {key: None if value is None or pd.isna(value) else int(value) for key, value in metrics.items()}
+
+def courier_metrics(df1):
+    """
+        Esta função tem a responsabilidade de calcular a maior e a menor idade dos
+        entregadores e a melhor e a pior condição dos veículos.
+    """
+    age, condition = df1['Delivery_person_Age'], df1['Vehicle_condition']
+
+    return metric_values({'maior_idade': age.max(), 'menor_idade': age.min(),
+                          'melhor_condicao': condition.max(), 'pior_condicao': condition.min()})
+
+def rating_by_traffic(df1):
+    """
+        Esta função tem a responsabilidade de calcular a avaliação média por tipo de tráfego.
+    """
+    df_aux = (df1.loc[:, ['Delivery_person_Ratings', 'Road_traffic_density']]
+                 .groupby('Road_traffic_density', observed=True)
+                 .agg({'Delivery_person_Ratings': ['mean']}))
+    df_aux.columns = ['Delivery mean']
+
+    return plain_keys(df_aux.reset_index())
+
+def rating_by_weather(df1):
+    """
+        Esta função tem a responsabilidade de calcular a avaliação média por condição climática.
+    """
+    df_aux = (df1.loc[:, ['Delivery_person_Ratings', 'Weatherconditions']]
+                 .groupby('Weatherconditions', observed=True)
+                 .agg({'Delivery_person_Ratings': ['mean']}))
+    df_aux.columns = ['Weather mean']
+
+    return plain_keys(df_aux.reset_index())
+
+def distance(df1):
+    """
+        Esta função tem a responsabilidade de calcular a distância média dos restaurantes
+        em relação aos locais de entrega, separada por cidade.
+    """
+    return plain_keys(df1.loc[:, ['City', 'distance']].groupby('City', observed=True).mean().reset_index())
+
+def avg_std_time_graph(df1):
+    """
+        Esta função tem a responsabilidade de calcular o
+        tempo médio e desvio padrão de entrega por cidade.
+    """
+    cols = ['City', 'Time_taken(min)']
+    df_aux = df1.loc[:, cols].groupby('City', observed=True).agg({'Time_taken(min)': ['mean', 'std']})
+    df_aux.columns = ['avg_time', 'std_time']
+
+    return plain_keys(df_aux.reset_index())
+
+def avg_std_time_on_traffic(df1):
+    """
+        Esta função tem a responsabilidade de calcular o tempo médio e o
+        desvio padrão por cidade e tipo tráfego.
+    """
+    cols = ['City', 'Time_taken(min)', 'Road_traffic_density']
+    df_aux = (df1.loc[:, cols]
+                 .groupby(['City', 'Road_traffic_density'], observed=True)
+                 .agg({'Time_taken(min)': ['mean', 'std']}))
+    df_aux.columns = ['avg_time', 'std_time']
+
+    return plain_keys(df_aux.reset_index())
+
+def map_medians(df1):
+    """
+        Esta função tem a responsabilidade de calcular a localização central
+        (mediana das coordenadas de entrega) de cada cidade por tipo de tráfego.
+    """
+    cols = ['City', 'Road_traffic_density', 'Delivery_location_latitude', 'Delivery_location_longitude']
+    df_aux = df1.loc[:, cols].groupby(['City', 'Road_traffic_density'], observed=True).median()
+
+    return plain_keys(df_aux.reset_index())
@@ -0,0 +1,102 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+from analytics import config
+
+# ==========================
+#        Constant's
+# ==========================
+
+# a partir desta quantidade de pontos as linhas usam WebGL (scattergl)
+WEBGL_THRESHOLD = 500
+
+# ==========================
+#        Function's
+# ==========================
+
+def _numeric_axis(values):
+    """
+        Esta função tem a responsabilidade de converter o eixo x para números
+        (datas viram inteiros; textos, como a semana do ano, viram a posição).
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype('float64')
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype='float64')
+
+    return np.arange(len(values), dtype='float64')
+
+def lttb(x, y, n_out):
+    """
+        Esta função tem a responsabilidade de escolher n_out pontos de uma série com o
+        algoritmo Largest-Triangle-Three-Buckets: o primeiro e o último ponto são
+        mantidos e, em cada bucket, fica o ponto que forma o maior triângulo com o
+        ponto escolhido antes e a média do bucket seguinte. A forma visual da série
+        (picos e vales) é preservada.
+
+        Output: posições dos pontos escolhidos
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:max(next_end, next_start + 1)].mean()
+        avg_y = y[next_start:max(next_end, next_start + 1)].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+def downsample(df_aux, x, y, max_points=None):
+    """
+        Esta função tem a responsabilidade de limitar a quantidade de pontos de uma
+        série (LTTB) ao máximo configurado, antes de montar o gráfico.
+    """
+    max_points = max_points or config.MAX_POINTS
+    if len(df_aux) <= max_points:
+        return df_aux
+
+    positions = lttb(_numeric_axis(df_aux[x]), df_aux[y].to_numpy(dtype='float64'), max_points)
+
+    return df_aux.iloc[positions]
+
+def line_chart(df_aux, x, y, max_points=None):
+    """
+        Esta função tem a responsabilidade de montar um gráfico de linha com a série
+        reduzida e, quando densa, desenhada com WebGL.
+    """
+    import plotly.express as px
+
+    df_aux = downsample(df_aux, x, y, max_points)
+    render_mode = 'webgl' if len(df_aux) > WEBGL_THRESHOLD else 'auto'
+
+    return px.line(df_aux, x=x, y=y, render_mode=render_mode)
+
+def bar_chart(df_aux, x, y, max_points=None):
+    """
+        Esta função tem a responsabilidade de montar um gráfico de barras; quando a
+        série passa do máximo de pontos, ela vira uma linha reduzida em WebGL, já que
+        barras não têm versão WebGL.
+    """
+    import plotly.express as px
+
+    max_points = max_points or config.MAX_POINTS
+    if len(df_aux) <= max_points:
+        return px.bar(df_aux, x=x, y=y)
+
+    return line_chart(df_aux, x, y, max_points)
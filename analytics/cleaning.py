@@ -0,0 +1,163 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+# ==========================
+#        Constant's
+# ==========================
+
+# colunas em que o valor 'NaN ' invalida a linha inteira
+NAN_COLUMNS = ['Delivery_person_Age', 'Road_traffic_density', 'City', 'Festival', 'multiple_deliveries']
+
+# colunas de texto com espaços sobrando no final
+TEXT_COLUMNS = ['ID', 'Weatherconditions', 'Road_traffic_density', 'Type_of_order',
+                'Type_of_vehicle', 'City', 'Festival']
+
+# colunas de texto com poucos valores distintos, guardadas como category
+CATEGORY_COLUMNS = ['City', 'Road_traffic_density', 'Weatherconditions', 'Type_of_order',
+                    'Type_of_vehicle', 'Festival']
+
+# colunas numéricas convertidas para o menor tipo que comporta os valores
+INTEGER_COLUMNS = ['Delivery_person_Age', 'Vehicle_condition', 'multiple_deliveries', 'Time_taken(min)']
+FLOAT_COLUMNS = ['Delivery_person_Ratings', 'Restaurant_latitude', 'Restaurant_longitude',
+                 'Delivery_location_latitude', 'Delivery_location_longitude']
+
+# ==========================
+#        Function's
+# ==========================
+
+def _convert_unique(series, func):
+    """
+        Esta função tem a responsabilidade de aplicar uma conversão de texto
+        apenas aos valores distintos da coluna e replicar o resultado para as
+        linhas através dos códigos do factorize. Colunas como datas, idades e
+        tempo de entrega têm poucas dezenas de valores distintos.
+    """
+    codes, uniques = pd.factorize(series)
+    if (codes < 0).any():
+        # colunas com NaN de verdade seguem o caminho linha a linha
+        return func(series)
+
+    values = np.asarray(func(pd.Series(uniques)))
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+def clean_code(df1):
+    """ Esta função tem a responsabilidade de limpar o dataframe
+        Tipos de limpeza:
+        1. Remoção dos dados NaN
+        2. Mudança do tipo da coluna de dados
+        3. Remoção dos espaços das variáveis de texto
+        4. Formatação da coluna de datas
+        5. Limpeza da coluna de tempo (remoção do texto da variável numérica)
+
+        Todas as regras de NaN são combinadas em uma única máscara e cada coluna
+        é filtrada e convertida uma única vez, sem cópias intermediárias do dataframe.
+        
+        Input: Dataframe
+        Output: Dataframe
+    """
+    # removendo NaN (máscara única)
+    selected = (df1[NAN_COLUMNS] != 'NaN ').all(axis='columns').to_numpy()
+    index = df1.index[selected]
+
+    columns = {}
+    for col in df1.columns:
+        series = pd.Series(df1[col].to_numpy()[selected], index=index, name=col)
+
+        # removendo os espaços das variáveis de texto (o ID é único por linha)
+        if col == 'ID':
+            series = series.str.strip()
+        elif col in TEXT_COLUMNS:
+            series = _convert_unique(series, lambda s: s.str.strip())
+
+        columns[col] = series
+
+    # conversão string para inteiro
+    columns['Delivery_person_Age'] = _convert_unique(columns['Delivery_person_Age'], lambda s: s.astype(int))
+    columns['multiple_deliveries'] = _convert_unique(columns['multiple_deliveries'], lambda s: s.astype(int))
+
+    # conversão string para float
+    columns['Delivery_person_Ratings'] = columns['Delivery_person_Ratings'].astype(float)
+
+    # conversão string para data
+    columns['Order_Date'] = _convert_unique(columns['Order_Date'],
+                                            lambda s: pd.to_datetime(s, format='%d-%m-%Y'))
+
+    # limpando a coluna time taken
+    columns['Time_taken(min)'] = _convert_unique(columns['Time_taken(min)'],
+                                                 lambda s: s.str.extract(r'\(min\) (\d+)', expand=False).astype(int))
+
+    return pd.DataFrame(columns, index=index)
+
+def compact_schema(df1):
+    """
+        Esta função tem a responsabilidade de reduzir a memória do dataframe limpo:
+        textos com poucos valores distintos viram category e as colunas numéricas
+        são convertidas para int8/int16/float32.
+        Os groupby sobre colunas category devem usar observed=True.
+
+        Input: Dataframe limpo
+        Output: Dataframe compacto
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df1.columns:
+            df1[col] = df1[col].astype('category')
+
+    for col in INTEGER_COLUMNS:
+        if col in df1.columns:
+            df1[col] = pd.to_numeric(df1[col], downcast='integer')
+
+    for col in FLOAT_COLUMNS:
+        if col in df1.columns:
+            df1[col] = pd.to_numeric(df1[col], downcast='float')
+
+    return df1
+
+def concat_orders(frames):
+    """
+        Esta função tem a responsabilidade de juntar dataframes limpos (por exemplo,
+        o histórico e um lote novo de pedidos) mantendo as colunas category e a
+        ordenação por Order_Date.
+    """
+    frames = [df.copy(deep=False) for df in frames if len(df) > 0] or frames[:1]
+    for col in CATEGORY_COLUMNS:
+        if all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in frames):
+            categories = frames[0][col].cat.categories
+            for df in frames[1:]:
+                categories = categories.union(df[col].cat.categories)
+            for df in frames:
+                df[col] = df[col].cat.set_categories(categories)
+
+    df1 = pd.concat(frames, ignore_index=True)
+    if not df1['Order_Date'].is_monotonic_increasing:
+        df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+
+    return df1
+
+def memory_report(before, after):
+    """
+        Esta função tem a responsabilidade de comparar o uso de memória, coluna a
+        coluna, de duas versões do mesmo dataframe.
+
+        Output: Dataframe com tipo e bytes antes/depois por coluna e o total.
+    """
+    df_aux = pd.DataFrame({'dtype_before': before.dtypes.astype(str),
+                           'bytes_before': before.memory_usage(index=False, deep=True),
+                           'dtype_after': after.dtypes.astype(str),
+                           'bytes_after': after.memory_usage(index=False, deep=True)})
+    df_aux.loc['Total', ['bytes_before', 'bytes_after']] = df_aux[['bytes_before', 'bytes_after']].sum()
+    df_aux['reduction'] = 1 - df_aux['bytes_after'] / df_aux['bytes_before']
+
+    return df_aux
+
+# ========================== Relatório via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m analytics.cleaning [dataset/train.csv]
+    import sys
+
+    df1 = clean_code(pd.read_csv(sys.argv[1] if len(sys.argv) > 1 else 'dataset/train.csv'))
+    print(memory_report(df1, compact_schema(df1.copy())).to_string())
@@ -0,0 +1,40 @@
+# ==========================
+#         Import's
+# ==========================
+
+import os
+
+# ==========================
+#        Configuração
+# ==========================
+
+# Parâmetros do dashboard lidos das variáveis de ambiente do servidor.
+
+# motor das agregações das páginas: 'pandas' (padrão), 'duckdb', 'polars' (esses
+# dois requerem o pacote de mesmo nome) ou 'materialized' (visões construídas
+# por python -m analytics.views)
+ENGINE = os.environ.get('CURRY_ENGINE', 'pandas')
+
+# contagem de entregadores únicos: 'hll' (sketches HyperLogLog) ou 'exact' (nunique)
+DISTINCT_MODE = os.environ.get('CURRY_DISTINCT_MODE', 'hll')
+
+# erro relativo esperado dos sketches HyperLogLog (0.01 = 1%)
+HLL_ERROR = float(os.environ.get('CURRY_HLL_ERROR', '0.01'))
+
+# máximo de pontos por série enviados ao navegador (~ largura do gráfico em pixels)
+MAX_POINTS = int(os.environ.get('CURRY_MAX_POINTS', '1000'))
+
+# máximo de pontos do mapa enviados ao navegador; acima disso os pedidos viram
+# uma marcação por célula da grade (analytics.spatial)
+MAP_MAX_POINTS = int(os.environ.get('CURRY_MAP_MAX_POINTS', '2000'))
+
+# memória máxima (MB) dos html de mapa guardados em cache em cada processo
+MAP_CACHE_MB = float(os.environ.get('CURRY_MAP_CACHE_MB', '64'))
+
+# medição de tempo por seção das páginas (painel de debug e log): '1' liga
+PROFILE = os.environ.get('CURRY_PROFILE', '0') == '1'
+
+# pasta (de preferência em memória, como /dev/shm) onde o dataset limpo fica
+# publicado uma única vez e é mapeado por todos os processos do servidor; vazio
+# mantém uma cópia por processo
+SHARED_DIR = os.environ.get('CURRY_SHARED_DIR', '')
@@ -0,0 +1,100 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+# ==========================
+#        Constant's
+# ==========================
+
+# granularidade do cubo: uma célula por dia x cidade x tráfego x festival x tipo de pedido
+CUBE_DIMENSIONS = ['Order_Date', 'City', 'Road_traffic_density', 'Festival', 'Type_of_order']
+
+# medidas aditivas guardadas em cada célula
+CUBE_MEASURES = ['orders', 'time_sum', 'time_sumsq']
+
+# ==========================
+#        Function's
+# ==========================
+
+def week_of_year(dates):
+    """
+        Esta função tem a responsabilidade de calcular a semana do ano no mesmo
+        formato usado pelas páginas (strftime '%U'). O strftime roda uma vez por
+        data distinta e o resultado é uma coluna category.
+    """
+    codes, days = pd.factorize(dates)
+    weeks = pd.DatetimeIndex(days).strftime('%U').to_numpy(dtype=object)
+
+    return pd.Categorical(weeks[codes])
+
+def build_cube(df1):
+    """
+        Esta função tem a responsabilidade de pré-agregar os pedidos em um cubo diário.
+        Cada célula guarda a quantidade de pedidos e a soma e soma dos quadrados do
+        tempo de entrega, o que permite recompor contagens, médias e desvios padrão
+        de qualquer recorte sem voltar às linhas.
+
+        Input: Dataframe limpo
+        Output: Dataframe do cubo, ordenado por Order_Date
+    """
+    time = df1['Time_taken(min)'].astype('float64')
+    df_aux = df1.loc[:, CUBE_DIMENSIONS].assign(time=time, time_sq=time * time)
+    cube = (df_aux.groupby(CUBE_DIMENSIONS, observed=True)
+                  .agg(orders=('time', 'size'), time_sum=('time', 'sum'), time_sumsq=('time_sq', 'sum'))
+                  .reset_index())
+    cube['week_of_year'] = week_of_year(cube['Order_Date'])
+
+    return cube
+
+def merge_cubes(*cubes):
+    """
+        Esta função tem a responsabilidade de somar cubos construídos a partir de
+        lotes diferentes de pedidos. Como todas as medidas são aditivas, o resultado
+        é igual ao cubo construído sobre todas as linhas.
+    """
+    cube = pd.concat(cubes, ignore_index=True)
+    for col in CUBE_DIMENSIONS[1:]:
+        if not isinstance(cube[col].dtype, pd.CategoricalDtype):
+            cube[col] = cube[col].astype('category')
+    cube = (cube.groupby(CUBE_DIMENSIONS, observed=True)[CUBE_MEASURES]
+                .sum()
+                .reset_index())
+    cube['week_of_year'] = week_of_year(cube['Order_Date'])
+
+    return cube
+
+def plain_keys(df_aux):
+    """
+        Esta função tem a responsabilidade de devolver as colunas category de uma
+        tabela agregada como texto. Uma coluna category carrega todas as categorias
+        do dataset, inclusive as que o filtro removeu, e o plotly monta os grupos a
+        partir delas (cidades sem pedidos no recorte quebram os gráficos).
+    """
+    for col in df_aux.columns:
+        if isinstance(df_aux[col].dtype, pd.CategoricalDtype):
+            df_aux[col] = df_aux[col].astype(str)
+
+    return df_aux
+
+def count_orders(cube, by):
+    """
+        Esta função tem a responsabilidade de somar a quantidade de pedidos do cubo
+        agrupando pelas colunas informadas.
+    """
+    return plain_keys(cube.groupby(by, observed=True)['orders'].sum().reset_index())
+
+def time_stats(cube, by):
+    """
+        Esta função tem a responsabilidade de recompor o tempo médio e o desvio padrão
+        (amostral, como o pandas) do tempo de entrega a partir das somas do cubo.
+    """
+    df_aux = cube.groupby(by, observed=True)[CUBE_MEASURES].sum()
+    n = df_aux['orders']
+    df_aux['avg_time'] = df_aux['time_sum'] / n
+    variance = (df_aux['time_sumsq'] - df_aux['time_sum'] ** 2 / n) / (n - 1)
+    df_aux['std_time'] = np.sqrt(variance.clip(lower=0).where(n > 1))
+
+    return plain_keys(df_aux.loc[:, ['avg_time', 'std_time']].reset_index())
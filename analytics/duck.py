@@ -0,0 +1,204 @@
+# ==========================
+#         Import's
+# ==========================
+
+import threading
+
+import pandas as pd
+
+from analytics.aggregations import metric_values
+from analytics.kpi import kpis_from_festival_stats
+from analytics.loader import columnar_files, dataset_fingerprint
+
+# ==========================
+#        Constant's
+# ==========================
+
+# semana do ano no mesmo formato das páginas (strftime '%U')
+WEEK_OF_YEAR = "strftime(CAST(Order_Date AS TIMESTAMP), '%U')"
+
+# ==========================
+#        Function's
+# ==========================
+
+def _quote(value):
+    """
+        Esta função tem a responsabilidade de escrever um texto como literal SQL.
+    """
+    return "'{}'".format(str(value).replace("'", "''"))
+
+def filter_clause(start=None, end=None, traffic_options=None):
+    """
+        Esta função tem a responsabilidade de traduzir os filtros da sidebar
+        (start <= data < end e tipos de tráfego) para um WHERE com parâmetros.
+
+        Output: (texto do WHERE, lista de parâmetros)
+    """
+    clauses, params = ['TRUE'], []
+    if start is not None:
+        clauses.append('Order_Date >= ?')
+        params.append(pd.Timestamp(start).to_pydatetime())
+    if end is not None:
+        clauses.append('Order_Date < ?')
+        params.append(pd.Timestamp(end).to_pydatetime())
+    if traffic_options is not None:
+        clauses.append('list_contains(?, Road_traffic_density)')
+        params.append([str(value) for value in traffic_options])
+
+    return ' AND '.join(clauses), params
+
+# ==========================
+#        Class
+# ==========================
+
+class DuckDBEngine:
+    """
+        Esta classe tem a responsabilidade de calcular as tabelas das páginas em SQL,
+        em um banco DuckDB embutido no processo, direto sobre os arquivos parquet
+        do dataset limpo (csv convertido e lotes do analytics.ingest).
+
+        Os filtros de data e tráfego entram no WHERE de cada consulta: o DuckDB lê
+        apenas as colunas usadas e pula os row groups fora do intervalo de datas,
+        e a página recebe somente a tabela agregada. As consultas usam todos os
+        núcleos e podem ir para o disco quando os dados não cabem na memória, então
+        o histórico não precisa estar carregado no processo. Entregadores únicos
+        são sempre contados de forma exata (count DISTINCT), que no DuckDB já é
+        rápido; o approx_count_distinct erra demais em recortes pequenos.
+
+        Mesmos métodos e mesmas colunas do analytics.engines.PandasEngine.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path):
+        import duckdb
+
+        self.path = path
+        self.connection = duckdb.connect(database=':memory:')
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._source = None
+
+    def load(self):
+        """
+            Esta função tem a responsabilidade de garantir que os arquivos parquet da
+            versão atual do dataset existem e montar a fonte das consultas.
+        """
+        fingerprint = dataset_fingerprint(self.path)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                files = ', '.join(_quote(name) for name in columnar_files(self.path))
+                self._source = 'read_parquet([{}], union_by_name=true)'.format(files)
+                self._fingerprint = fingerprint
+
+        return self._source
+
+    def query(self, sql, start=None, end=None, traffic_options=None, params=()):
+        """
+            Esta função tem a responsabilidade de executar uma consulta sobre os
+            pedidos filtrados, disponíveis na consulta como a tabela 'orders'.
+
+            Input: SQL (SELECT ... FROM orders ...), filtros da sidebar e parâmetros
+                   extras da consulta
+            Output: Dataframe com o resultado
+        """
+        where, where_params = filter_clause(start, end, traffic_options)
+        sql = 'WITH orders AS (SELECT * FROM {} WHERE {}) {}'.format(self.load(), where, sql)
+
+        # cada thread (sessão do streamlit) usa o próprio cursor da conexão
+        cursor = self.connection.cursor()
+        try:
+            return cursor.execute(sql, where_params + list(params)).df()
+        finally:
+            cursor.close()
+
+    def count(self, start, end, traffic_options):
+        return int(self.query('SELECT count(*) AS orders FROM orders', start, end, traffic_options)['orders'].iloc[0])
+
+    def order_metric(self, start, end, traffic_options):
+        return self.query('SELECT Order_Date, count(*) AS orders FROM orders GROUP BY 1 ORDER BY 1',
+                          start, end, traffic_options)
+
+    def traffic_order_share(self, start, end, traffic_options):
+        return self.query('SELECT Road_traffic_density, count(*) AS orders, '
+                          'count(*) / sum(count(*)) OVER () AS deliveries_perc '
+                          'FROM orders GROUP BY 1 ORDER BY 1', start, end, traffic_options)
+
+    def traffic_order_city(self, start, end, traffic_options):
+        return self.query('SELECT City, Road_traffic_density, count(*) AS orders '
+                          'FROM orders GROUP BY 1, 2 ORDER BY 1, 2', start, end, traffic_options)
+
+    def order_by_week(self, start, end, traffic_options):
+        return self.query('SELECT {} AS week_of_year, count(*) AS orders '
+                          'FROM orders GROUP BY 1 ORDER BY 1'.format(WEEK_OF_YEAR), start, end, traffic_options)
+
+    def order_share_by_week(self, start, end, traffic_options):
+        df_aux = self.query('SELECT {} AS week_of_year, count(*) AS orders, '
+                            'count(DISTINCT Delivery_person_ID) AS Delivery_person_ID '
+                            'FROM orders GROUP BY 1 ORDER BY 1'.format(WEEK_OF_YEAR), start, end, traffic_options)
+        df_aux['order_by_deliver'] = df_aux['orders'] / df_aux['Delivery_person_ID']
+
+        return df_aux
+
+    def courier_metrics(self, start, end, traffic_options):
+        df_aux = self.query('SELECT max(Delivery_person_Age) AS maior_idade, min(Delivery_person_Age) AS menor_idade, '
+                            'max(Vehicle_condition) AS melhor_condicao, min(Vehicle_condition) AS pior_condicao '
+                            'FROM orders', start, end, traffic_options)
+
+        # recorte vazio: o DuckDB devolve NULL (pd.NA), que o st.metric não aceita
+        return metric_values(df_aux.iloc[0].to_dict())
+
+    def rating_by_traffic(self, start, end, traffic_options):
+        return self.query('SELECT Road_traffic_density, avg(Delivery_person_Ratings) AS "Delivery mean" '
+                          'FROM orders GROUP BY 1 ORDER BY 1', start, end, traffic_options)
+
+    def rating_by_weather(self, start, end, traffic_options):
+        return self.query('SELECT Weatherconditions, avg(Delivery_person_Ratings) AS "Weather mean" '
+                          'FROM orders GROUP BY 1 ORDER BY 1', start, end, traffic_options)
+
+    def courier_ratings(self, start, end, traffic_options):
+        return self.query('SELECT Delivery_person_ID, avg(Delivery_person_Ratings) AS "Delivery mean" '
+                          'FROM orders GROUP BY 1 ORDER BY 1', start, end, traffic_options)
+
+    def rank_couriers(self, start, end, traffic_options, k=10):
+        tables = []
+        for order in ['ASC', 'DESC']:
+            tables.append(self.query(
+                'SELECT City, Delivery_person_ID, "Time_taken(min)" FROM ('
+                '  SELECT *, row_number() OVER (PARTITION BY City ORDER BY "Time_taken(min)" {}, Delivery_person_ID) AS position'
+                '  FROM (SELECT City, Delivery_person_ID, avg("Time_taken(min)") AS "Time_taken(min)" FROM orders GROUP BY 1, 2)'
+                ') WHERE position <= ? ORDER BY City, position'.format(order), start, end, traffic_options, [k]))
+
+        return tables[0], tables[1]
+
+    def restaurant_kpis(self, start, end, traffic_options):
+        df_aux = self.query('SELECT Festival, avg("Time_taken(min)") AS avg_time, stddev_samp("Time_taken(min)") AS std_time, '
+                            'sum(distance) AS distance_sum, count(distance) AS deliveries '
+                            'FROM orders GROUP BY 1', start, end, traffic_options).set_index('Festival')
+        couriers = self.query('SELECT count(DISTINCT Delivery_person_ID) AS couriers FROM orders',
+                              start, end, traffic_options)['couriers'].iloc[0]
+
+        return kpis_from_festival_stats(df_aux, int(couriers))
+
+    def distance(self, start, end, traffic_options):
+        return self.query('SELECT City, avg(distance) AS distance FROM orders GROUP BY 1 ORDER BY 1',
+                          start, end, traffic_options)
+
+    def avg_std_time_graph(self, start, end, traffic_options):
+        return self.query('SELECT City, avg("Time_taken(min)") AS avg_time, stddev_samp("Time_taken(min)") AS std_time '
+                          'FROM orders GROUP BY 1 ORDER BY 1', start, end, traffic_options)
+
+    def avg_std_time_on_traffic(self, start, end, traffic_options):
+        return self.query('SELECT City, Road_traffic_density, avg("Time_taken(min)") AS avg_time, '
+                          'stddev_samp("Time_taken(min)") AS std_time '
+                          'FROM orders GROUP BY 1, 2 ORDER BY 1, 2', start, end, traffic_options)
+
+    def time_by_city_order(self, start, end, traffic_options):
+        return self.query('SELECT City, Type_of_order, avg("Time_taken(min)") AS avg_time, '
+                          'stddev_samp("Time_taken(min)") AS std_time '
+                          'FROM orders GROUP BY 1, 2 ORDER BY 1, 2', start, end, traffic_options)
+
+    def map_medians(self, start, end, traffic_options):
+        return self.query('SELECT City, Road_traffic_density, median(Delivery_location_latitude) AS Delivery_location_latitude, '
+                          'median(Delivery_location_longitude) AS Delivery_location_longitude '
+                          'FROM orders GROUP BY 1, 2 ORDER BY 1, 2', start, end, traffic_options)
@@ -0,0 +1,154 @@
+# ==========================
+#         Import's
+# ==========================
+
+import importlib
+import os
+import threading
+
+from analytics import aggregations, config
+from analytics.kpi import restaurant_kpis
+from analytics.loader import dataset_fingerprint, load_cube_index, load_index, load_sketches
+from analytics.ranking import rank_couriers
+from analytics.sketch import couriers_by_week
+from analytics.tables import courier_ratings, time_by_city_order
+
+# ==========================
+#        Constant's
+# ==========================
+
+# motores disponíveis: nome -> 'módulo:classe' (importados só quando escolhidos)
+ENGINES = {'pandas': 'analytics.engines:PandasEngine',
+           'duckdb': 'analytics.duck:DuckDBEngine',
+           'polars': 'analytics.lazy:PolarsEngine',
+           'materialized': 'analytics.views:MaterializedEngine'}
+
+_ENGINES = {}
+_LOCK = threading.Lock()
+
+# ==========================
+#        Class
+# ==========================
+
+class PandasEngine:
+    """
+        Esta classe tem a responsabilidade de calcular as tabelas das páginas em
+        pandas, sobre o dataset, o cubo diário e os sketches em cache no processo.
+
+        Todos os motores têm os mesmos métodos: cada um recebe os filtros da sidebar
+        (start <= data < end e lista de tipos de tráfego) e devolve a tabela pronta
+        para o gráfico, com as mesmas colunas das funções de analytics.aggregations.
+    """
+
+    name = 'pandas'
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """
+            Esta função tem a responsabilidade de carregar (ou validar) os dados em cache.
+        """
+        load_index(self.path)
+        load_cube_index(self.path)
+        load_sketches(self.path)
+
+    def rows(self, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de devolver os pedidos do recorte.
+        """
+        return load_index(self.path).select(start, end, list(traffic_options))
+
+    def cube(self, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de devolver as células do cubo do recorte.
+        """
+        return load_cube_index(self.path).select(start, end, list(traffic_options))
+
+    def count(self, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de contar os pedidos do recorte (a
+            etapa de filtro, medida à parte pelo PageProfiler).
+        """
+        return len(self.rows(start, end, traffic_options))
+
+    def order_metric(self, start, end, traffic_options):
+        return aggregations.order_metric(self.cube(start, end, traffic_options))
+
+    def traffic_order_share(self, start, end, traffic_options):
+        return aggregations.traffic_order_share(self.cube(start, end, traffic_options))
+
+    def traffic_order_city(self, start, end, traffic_options):
+        return aggregations.traffic_order_city(self.cube(start, end, traffic_options))
+
+    def order_by_week(self, start, end, traffic_options):
+        return aggregations.order_by_week(self.cube(start, end, traffic_options))
+
+    def order_share_by_week(self, start, end, traffic_options):
+        # no modo 'hll' os entregadores únicos vêm só dos sketches: as linhas do
+        # recorte são selecionadas apenas para a contagem exata
+        if config.DISTINCT_MODE == 'exact':
+            df_couriers = couriers_by_week(self.rows(start, end, traffic_options))
+        else:
+            df_couriers = couriers_by_week(None, load_sketches(self.path), start, end, traffic_options)
+        return aggregations.order_share_by_week(self.cube(start, end, traffic_options), df_couriers)
+
+    def courier_metrics(self, start, end, traffic_options):
+        return aggregations.courier_metrics(self.rows(start, end, traffic_options))
+
+    def rating_by_traffic(self, start, end, traffic_options):
+        return aggregations.rating_by_traffic(self.rows(start, end, traffic_options))
+
+    def rating_by_weather(self, start, end, traffic_options):
+        return aggregations.rating_by_weather(self.rows(start, end, traffic_options))
+
+    def courier_ratings(self, start, end, traffic_options):
+        return courier_ratings(self.path, dataset_fingerprint(self.path), start, end, traffic_options)
+
+    def rank_couriers(self, start, end, traffic_options, k=10):
+        return rank_couriers(self.rows(start, end, traffic_options), k)
+
+    def restaurant_kpis(self, start, end, traffic_options):
+        return restaurant_kpis(self.rows(start, end, traffic_options), load_sketches(self.path),
+                               start, end, traffic_options)
+
+    def distance(self, start, end, traffic_options):
+        return aggregations.distance(self.rows(start, end, traffic_options))
+
+    def avg_std_time_graph(self, start, end, traffic_options):
+        return aggregations.avg_std_time_graph(self.rows(start, end, traffic_options))
+
+    def avg_std_time_on_traffic(self, start, end, traffic_options):
+        return aggregations.avg_std_time_on_traffic(self.rows(start, end, traffic_options))
+
+    def time_by_city_order(self, start, end, traffic_options):
+        return time_by_city_order(self.path, dataset_fingerprint(self.path), start, end, traffic_options)
+
+    def map_medians(self, start, end, traffic_options):
+        return aggregations.map_medians(self.rows(start, end, traffic_options))
+
+# ==========================
+#        Function's
+# ==========================
+
+def get_engine(path='dataset/train.csv', name=None):
+    """
+        Esta função tem a responsabilidade de devolver o motor das agregações
+        configurado (CURRY_ENGINE), um por processo e arquivo de dados.
+
+        Input: caminho do csv e nome do motor (padrão: config.ENGINE)
+        Output: instância do motor
+    """
+    name = name or config.ENGINE
+    if name not in ENGINES:
+        raise ValueError('motor deve ser um de {}'.format(list(ENGINES)))
+
+    key = (name, os.path.abspath(path))
+    with _LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            module, cls = ENGINES[name].split(':')
+            engine = getattr(importlib.import_module(module), cls)(path)
+            _ENGINES[key] = engine
+
+    return engine
@@ -0,0 +1,83 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+
+from analytics.charts import bar_chart, line_chart
+
+# ==========================
+#        Function's
+# ==========================
+
+# Gráficos das páginas, montados a partir das tabelas devolvidas pelo motor das
+# agregações (ver analytics.engines). O plotly só é importado quando um gráfico
+# é montado.
+
+def order_metric(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar a contagem de pedidos por dia.
+    """
+    return bar_chart(df_aux, x='Order_Date', y='orders')
+
+def traffic_order_share(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar a distribuição de pedidos por tipo de tráfego.
+    """
+    import plotly.express as px
+
+    return px.pie(df_aux, values='deliveries_perc', names='Road_traffic_density')
+
+def traffic_order_city(df_aux):
+    """
+        Está função tem a responsabilidade de comparar o volume de pedidos por cidade e tipo de trafego.
+    """
+    import plotly.express as px
+
+    return px.scatter(df_aux, x='City', y='Road_traffic_density', size='orders', color='City')
+
+def order_by_week(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar a contagem de pedidos por semana.
+    """
+    return line_chart(df_aux, x='week_of_year', y='orders')
+
+def order_share_by_week(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar a quantidade de pedidos por
+        entregador único em cada semana.
+    """
+    return line_chart(df_aux, x='week_of_year', y='order_by_deliver')
+
+def distance(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar a distância média dos restaurantes
+        em relação aos locais de entrega, separada por cidade.
+    """
+    import plotly.graph_objects as go
+
+    return go.Figure(data=[go.Pie(labels=df_aux['City'], values=df_aux['distance'], pull=[0, 0.1, 0])])
+
+def avg_std_time_graph(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar o tempo médio e o desvio padrão
+        de entrega por cidade.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='Control', x=df_aux['City'], y=df_aux['avg_time'],
+                         error_y=dict(type='data', array=df_aux['std_time'])))
+
+    return fig
+
+def avg_std_time_on_traffic(df_aux):
+    """
+        Esta função tem a responsabilidade de mostrar o tempo médio e o desvio padrão
+        por cidade e tipo tráfego.
+    """
+    import plotly.express as px
+
+    return px.sunburst(df_aux, path=['City', 'Road_traffic_density'], values='avg_time',
+                       color='std_time', color_continuous_scale='RdBu',
+                       color_continuous_midpoint=np.average(df_aux['std_time']))
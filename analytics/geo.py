@@ -0,0 +1,40 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+
+# ==========================
+#        Constant's
+# ==========================
+
+# mesmo raio médio da Terra usado pela biblioteca haversine
+AVG_EARTH_RADIUS_KM = 6371.0088
+
+COORD_COLUMNS = ['Restaurant_latitude', 'Restaurant_longitude',
+                 'Delivery_location_latitude', 'Delivery_location_longitude']
+
+# ==========================
+#        Function's
+# ==========================
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+        Esta função tem a responsabilidade de calcular a distância de grande círculo
+        (fórmula de haversine) em km entre dois conjuntos de coordenadas.
+        Recebe arrays (ou escalares) em graus e calcula todas as linhas de uma vez.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype='float64')) for x in (lat1, lon1, lat2, lon2))
+    d = (np.sin((lat2 - lat1) * 0.5) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2)
+
+    return 2 * AVG_EARTH_RADIUS_KM * np.arcsin(np.sqrt(d))
+
+def add_distance(df1):
+    """
+        Esta função tem a responsabilidade de criar a coluna 'distance' com a
+        distância entre o restaurante e o local de entrega de cada pedido.
+    """
+    df1['distance'] = haversine_km(*(df1[col].to_numpy() for col in COORD_COLUMNS))
+
+    return df1
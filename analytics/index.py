@@ -0,0 +1,86 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+# ==========================
+#        Class
+# ==========================
+
+class OrderIndex:
+    """
+        Esta classe tem a responsabilidade de indexar um dataframe ordenado por data
+        para aplicar os filtros da sidebar sem varrer a tabela inteira:
+        1. O intervalo de datas vira uma busca binária (searchsorted) e um fatiamento.
+        2. Cada tipo de tráfego tem um bitmap (bits empacotados) pré-calculado;
+           qualquer combinação do multiselect vira um OR entre bitmaps.
+
+        O custo do filtro depende do tamanho do intervalo selecionado e não do
+        tamanho da tabela.
+    """
+
+    def __init__(self, df1, date_col='Order_Date', traffic_col='Road_traffic_density'):
+        if not df1[date_col].is_monotonic_increasing:
+            df1 = df1.sort_values(date_col, kind='mergesort')
+
+        self.frame = df1
+        self.dates = df1[date_col].to_numpy()
+        self.bitmaps = {}
+        traffic = df1[traffic_col]
+        for value in pd.unique(traffic):
+            self.bitmaps[value] = np.packbits((traffic == value).to_numpy())
+
+    def date_bounds(self, start=None, end=None):
+        """
+            Esta função tem a responsabilidade de localizar, por busca binária, as
+            posições das linhas com start <= data < end.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'ns'), side='left'))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'ns'), side='left'))
+
+        return lo, max(lo, hi)
+
+    def traffic_mask(self, traffic_options, lo, hi):
+        """
+            Esta função tem a responsabilidade de combinar (OR) os bitmaps dos tipos de
+            tráfego selecionados, apenas no trecho [lo, hi) da tabela.
+        """
+        first, last = lo // 8, (hi + 7) // 8
+        packed = np.zeros(last - first, dtype=np.uint8)
+        for value in traffic_options:
+            bitmap = self.bitmaps.get(value)
+            if bitmap is not None:
+                np.bitwise_or(packed, bitmap[first:last], out=packed)
+
+        offset = lo - first * 8
+        return np.unpackbits(packed)[offset:offset + hi - lo].astype(bool)
+
+    def positions(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de devolver as posições (no dataframe
+            indexado) das linhas do recorte, para consultas em outros índices sobre
+            o mesmo dataframe (ver analytics.spatial).
+        """
+        lo, hi = self.date_bounds(start, end)
+        if traffic_options is None or set(self.bitmaps).issubset(traffic_options):
+            return np.arange(lo, hi)
+
+        return lo + np.flatnonzero(self.traffic_mask(traffic_options, lo, hi))
+
+    def select(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de aplicar os filtros de data
+            (start <= data < end) e de tráfego.
+
+            Input: datas limite (ou None) e lista de tipos de tráfego (None = todos)
+            Output: Dataframe filtrado
+        """
+        lo, hi = self.date_bounds(start, end)
+        df_aux = self.frame.iloc[lo:hi]
+
+        if traffic_options is None or set(self.bitmaps).issubset(traffic_options):
+            return df_aux.copy(deep=False)
+
+        return df_aux.loc[self.traffic_mask(traffic_options, lo, hi), :]
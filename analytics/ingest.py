@@ -0,0 +1,56 @@
+# ==========================
+#         Import's
+# ==========================
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+from analytics.loader import ROW_GROUP_SIZE, batches_dir, columnar_table, prepare_orders
+
+# ==========================
+#        Function's
+# ==========================
+
+def ingest_batch(batch_path, path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de incluir um lote novo de pedidos no
+        dataset sem reprocessar o histórico:
+        1. Lê apenas o csv do lote (mesmo formato do train.csv).
+        2. Aplica as mesmas regras do clean_code, calcula a distância e compacta os tipos.
+        3. Grava o lote limpo como um parquet na pasta de lotes do dataset.
+
+        Os servidores do dashboard percebem o lote novo na próxima execução e somam
+        apenas esse lote ao dataset, ao cubo diário e aos índices em cache.
+
+        Input: caminho do csv do lote e do csv principal do dataset
+        Output: caminho do arquivo do lote gravado
+    """
+    import pyarrow.parquet as pq
+
+    df1 = prepare_orders(pd.read_csv(batch_path))
+    df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+
+    folder = batches_dir(path)
+    os.makedirs(folder, exist_ok=True)
+
+    # nome com timestamp em ns: a ordem alfabética é a ordem de chegada
+    target = os.path.join(folder, '{:020d}-{}.parquet'.format(time.time_ns(), os.getpid()))
+    tmp = target + '.tmp'
+    pq.write_table(columnar_table(df1), tmp, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, target)
+
+    return target
+
+# ========================== Ingestão via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m analytics.ingest lote.csv [dataset/train.csv]
+    if len(sys.argv) < 2:
+        sys.exit('uso: python -m analytics.ingest lote.csv [dataset/train.csv]')
+
+    dataset = sys.argv[2] if len(sys.argv) > 2 else 'dataset/train.csv'
+    target = ingest_batch(sys.argv[1], dataset)
+    print('Lote gravado em {}'.format(target))
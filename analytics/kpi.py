@@ -0,0 +1,73 @@
+# ==========================
+#         Import's
+# ==========================
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from analytics.sketch import unique_couriers
+
+# ==========================
+#        Class
+# ==========================
+
+class RestaurantKPIs(NamedTuple):
+    """
+        Valores dos cards de métricas da visão restaurantes.
+        Tempos em minutos e distância em km, arredondados em uma casa decimal.
+        None quando o recorte não tem entregas do grupo.
+    """
+    unique_couriers: int
+    avg_distance: Optional[float]
+    festival_avg_time: Optional[float]
+    festival_std_time: Optional[float]
+    no_festival_avg_time: Optional[float]
+    no_festival_std_time: Optional[float]
+
+# ==========================
+#        Function's
+# ==========================
+
+def _round(value):
+    """
+        Esta função tem a responsabilidade de arredondar o valor do card em uma casa
+        decimal (ou devolver None quando não há valor).
+    """
+    return None if value is None or np.isnan(value) else round(float(value), 1)
+
+def restaurant_kpis(df1, sketches=None, start=None, end=None, traffic_options=None):
+    """
+        Esta função tem a responsabilidade de calcular todos os cards da visão
+        restaurantes com um único groupby por Festival: tempo médio e desvio padrão
+        com e sem festival e, somando os grupos, a distância média.
+        Os entregadores únicos vêm dos sketches (ou do nunique, no modo exato).
+
+        Input: Dataframe filtrado, sketches e os filtros usados no recorte
+        Output: RestaurantKPIs
+    """
+    df_aux = (df1.loc[:, ['Festival', 'Time_taken(min)', 'distance']]
+                 .groupby('Festival', observed=True)
+                 .agg(avg_time=('Time_taken(min)', 'mean'), std_time=('Time_taken(min)', 'std'),
+                      distance_sum=('distance', 'sum'), deliveries=('distance', 'count')))
+
+    return kpis_from_festival_stats(df_aux, unique_couriers(df1, sketches, start, end, traffic_options))
+
+def kpis_from_festival_stats(df_aux, couriers):
+    """
+        Esta função tem a responsabilidade de montar os cards a partir das
+        estatísticas por Festival (índice 'Yes'/'No' e colunas avg_time, std_time,
+        distance_sum e deliveries), calculadas por qualquer um dos motores.
+    """
+    def stat(festival, col):
+        return _round(df_aux.at[festival, col]) if festival in df_aux.index else None
+
+    deliveries = df_aux['deliveries'].sum()
+    avg_distance = df_aux['distance_sum'].sum() / deliveries if deliveries else None
+
+    return RestaurantKPIs(unique_couriers=couriers,
+                          avg_distance=_round(avg_distance),
+                          festival_avg_time=stat('Yes', 'avg_time'),
+                          festival_std_time=stat('Yes', 'std_time'),
+                          no_festival_avg_time=stat('No', 'avg_time'),
+                          no_festival_std_time=stat('No', 'std_time'))
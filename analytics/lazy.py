@@ -0,0 +1,246 @@
+# ==========================
+#         Import's
+# ==========================
+
+import threading
+
+import pandas as pd
+
+from analytics.aggregations import metric_values
+from analytics.kpi import kpis_from_festival_stats
+from analytics.loader import columnar_files, dataset_fingerprint
+
+# ==========================
+#        Constant's
+# ==========================
+
+# colunas categóricas do parquet, tratadas como texto nas consultas
+TEXT_KEYS = ['Weatherconditions', 'Road_traffic_density', 'Type_of_order', 'Type_of_vehicle', 'Festival', 'City']
+
+# ==========================
+#        Function's
+# ==========================
+
+def _with_week_of_year(lf):
+    """
+        Esta função tem a responsabilidade de criar a semana do ano no mesmo formato
+        das páginas (strftime '%U').
+    """
+    import polars as pl
+
+    return lf.with_columns(week_of_year=pl.col('Order_Date').dt.strftime('%U'))
+
+# ==========================
+#        Class
+# ==========================
+
+class PolarsEngine:
+    """
+        Esta classe tem a responsabilidade de calcular as tabelas das páginas com
+        consultas lazy do Polars sobre os arquivos parquet do dataset limpo (csv
+        convertido e lotes do analytics.ingest).
+
+        Os filtros da sidebar e o groupby de cada tabela viram um único plano de
+        consulta: o otimizador lê do parquet apenas as colunas usadas (projection
+        pushdown), aplica os filtros na leitura (predicate pushdown) e executa o
+        plano em todos os núcleos. Entregadores únicos são contados de forma exata.
+
+        Mesmos métodos e mesmas colunas do analytics.engines.PandasEngine; as linhas
+        vêm ordenadas pelas chaves do agrupamento.
+    """
+
+    name = 'polars'
+
+    def __init__(self, path):
+        import polars  # noqa: F401
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._files = None
+
+    def load(self):
+        """
+            Esta função tem a responsabilidade de garantir que os arquivos parquet da
+            versão atual do dataset existem e listar os arquivos das consultas.
+        """
+        fingerprint = dataset_fingerprint(self.path)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._files = columnar_files(self.path)
+                self._fingerprint = fingerprint
+
+        return self._files
+
+    def orders(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de montar a consulta lazy dos pedidos
+            com os filtros da sidebar (start <= data < end e tipos de tráfego).
+
+            Output: polars.LazyFrame (nada é lido até o collect)
+        """
+        import polars as pl
+
+        lf = pl.scan_parquet(self.load()).with_columns(pl.col(TEXT_KEYS).cast(pl.String))
+        if start is not None:
+            lf = lf.filter(pl.col('Order_Date') >= pd.Timestamp(start).to_pydatetime())
+        if end is not None:
+            lf = lf.filter(pl.col('Order_Date') < pd.Timestamp(end).to_pydatetime())
+        if traffic_options is not None:
+            lf = lf.filter(pl.col('Road_traffic_density').is_in([str(value) for value in traffic_options]))
+
+        return lf
+
+    def _time_stats(self, by, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de calcular o tempo médio e o desvio
+            padrão (amostral) de entrega por grupo.
+        """
+        import polars as pl
+
+        return (self.orders(start, end, traffic_options)
+                    .group_by(by)
+                    .agg(avg_time=pl.col('Time_taken(min)').mean(), std_time=pl.col('Time_taken(min)').std())
+                    .sort(by)
+                    .collect()
+                    .to_pandas())
+
+    def _count(self, lf, by):
+        """
+            Esta função tem a responsabilidade de contar os pedidos da consulta por grupo.
+        """
+        import polars as pl
+
+        return (lf.group_by(by)
+                    .agg(orders=pl.len().cast(pl.Int64))
+                    .sort(by)
+                    .collect()
+                    .to_pandas())
+
+    def count(self, start, end, traffic_options):
+        import polars as pl
+
+        return self.orders(start, end, traffic_options).select(pl.len()).collect().item()
+
+    def order_metric(self, start, end, traffic_options):
+        return self._count(self.orders(start, end, traffic_options), 'Order_Date')
+
+    def traffic_order_share(self, start, end, traffic_options):
+        df_aux = self._count(self.orders(start, end, traffic_options), 'Road_traffic_density')
+        df_aux['deliveries_perc'] = df_aux['orders'] / df_aux['orders'].sum()
+
+        return df_aux
+
+    def traffic_order_city(self, start, end, traffic_options):
+        return self._count(self.orders(start, end, traffic_options), ['City', 'Road_traffic_density'])
+
+    def order_by_week(self, start, end, traffic_options):
+        return self._count(_with_week_of_year(self.orders(start, end, traffic_options)), 'week_of_year')
+
+    def order_share_by_week(self, start, end, traffic_options):
+        import polars as pl
+
+        df_aux = (_with_week_of_year(self.orders(start, end, traffic_options))
+                      .group_by('week_of_year')
+                      .agg(orders=pl.len().cast(pl.Int64),
+                           Delivery_person_ID=pl.col('Delivery_person_ID').n_unique().cast(pl.Int64))
+                      .sort('week_of_year')
+                      .collect()
+                      .to_pandas())
+        df_aux['order_by_deliver'] = df_aux['orders'] / df_aux['Delivery_person_ID']
+
+        return df_aux
+
+    def courier_metrics(self, start, end, traffic_options):
+        import polars as pl
+
+        df_aux = (self.orders(start, end, traffic_options)
+                      .select(maior_idade=pl.col('Delivery_person_Age').max(),
+                              menor_idade=pl.col('Delivery_person_Age').min(),
+                              melhor_condicao=pl.col('Vehicle_condition').max(),
+                              pior_condicao=pl.col('Vehicle_condition').min())
+                      .collect())
+
+        return metric_values(df_aux.row(0, named=True))
+
+    def _mean_rating(self, by, name, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de calcular a avaliação média por grupo.
+        """
+        import polars as pl
+
+        return (self.orders(start, end, traffic_options)
+                    .group_by(by)
+                    .agg(pl.col('Delivery_person_Ratings').cast(pl.Float64).mean().alias(name))
+                    .sort(by)
+                    .collect()
+                    .to_pandas())
+
+    def rating_by_traffic(self, start, end, traffic_options):
+        return self._mean_rating('Road_traffic_density', 'Delivery mean', start, end, traffic_options)
+
+    def rating_by_weather(self, start, end, traffic_options):
+        return self._mean_rating('Weatherconditions', 'Weather mean', start, end, traffic_options)
+
+    def courier_ratings(self, start, end, traffic_options):
+        return self._mean_rating('Delivery_person_ID', 'Delivery mean', start, end, traffic_options)
+
+    def rank_couriers(self, start, end, traffic_options, k=10):
+        import polars as pl
+
+        means = (self.orders(start, end, traffic_options)
+                     .group_by(['City', 'Delivery_person_ID'])
+                     .agg(pl.col('Time_taken(min)').mean()))
+        tables = []
+        for descending in [False, True]:
+            tables.append(means.sort(['City', 'Time_taken(min)', 'Delivery_person_ID'],
+                                     descending=[False, descending, False])
+                               .group_by('City', maintain_order=True)
+                               .head(k)
+                               .collect()
+                               .to_pandas())
+
+        return tables[0], tables[1]
+
+    def restaurant_kpis(self, start, end, traffic_options):
+        import polars as pl
+
+        lf = self.orders(start, end, traffic_options)
+        df_aux = (lf.group_by('Festival')
+                    .agg(avg_time=pl.col('Time_taken(min)').mean(), std_time=pl.col('Time_taken(min)').std(),
+                         distance_sum=pl.col('distance').sum(), deliveries=pl.col('distance').count())
+                    .collect()
+                    .to_pandas()
+                    .set_index('Festival'))
+        couriers = lf.select(pl.col('Delivery_person_ID').n_unique()).collect().item()
+
+        return kpis_from_festival_stats(df_aux, int(couriers))
+
+    def distance(self, start, end, traffic_options):
+        import polars as pl
+
+        return (self.orders(start, end, traffic_options)
+                    .group_by('City')
+                    .agg(pl.col('distance').mean())
+                    .sort('City')
+                    .collect()
+                    .to_pandas())
+
+    def avg_std_time_graph(self, start, end, traffic_options):
+        return self._time_stats('City', start, end, traffic_options)
+
+    def avg_std_time_on_traffic(self, start, end, traffic_options):
+        return self._time_stats(['City', 'Road_traffic_density'], start, end, traffic_options)
+
+    def time_by_city_order(self, start, end, traffic_options):
+        return self._time_stats(['City', 'Type_of_order'], start, end, traffic_options)
+
+    def map_medians(self, start, end, traffic_options):
+        import polars as pl
+
+        return (self.orders(start, end, traffic_options)
+                    .group_by(['City', 'Road_traffic_density'])
+                    .agg(pl.col(['Delivery_location_latitude', 'Delivery_location_longitude']).median())
+                    .sort(['City', 'Road_traffic_density'])
+                    .collect()
+                    .to_pandas())
@@ -0,0 +1,511 @@
+# ==========================
+#         Import's
+# ==========================
+
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics.cleaning import CATEGORY_COLUMNS, FLOAT_COLUMNS, INTEGER_COLUMNS, clean_code, compact_schema, concat_orders
+from analytics.cube import build_cube, merge_cubes, week_of_year
+from analytics.geo import add_distance
+from analytics.index import OrderIndex
+from analytics.shared import attach, mapped_arrays, share
+from analytics.sketch import CourierSketches
+from analytics.spatial import GridIndex
+from analytics.stream import read_clean_chunks
+
+# ==========================
+#        Constant's
+# ==========================
+
+# chave do metadado do parquet que guarda a versão do csv de origem
+SOURCE_METADATA_KEY = b'curry_company.source'
+
+# versão do formato do dataset limpo; incrementar ao mudar colunas ou tipos
+# força a reconstrução dos arquivos colunares antigos
+SCHEMA_VERSION = 5
+
+# linhas por row group do parquet: como as linhas estão ordenadas por data, cada
+# row group cobre poucos dias e leitores com filtro (DuckDB) pulam os demais
+ROW_GROUP_SIZE = 64 * 1024
+
+# ==========================
+#        Cache
+# ==========================
+
+# Cache do processo inteiro: compartilhado por todas as páginas e sessões
+# do Streamlit que rodam no mesmo servidor.
+_CACHE = {}
+_LOCK = threading.RLock()
+
+# ==========================
+#        Function's
+# ==========================
+
+def batches_dir(path):
+    """
+        Esta função tem a responsabilidade de definir a pasta onde ficam os lotes
+        de pedidos incluídos depois do csv (ver analytics.ingest).
+    """
+    return os.path.splitext(path)[0] + '.batches'
+
+def list_batches(path):
+    """
+        Esta função tem a responsabilidade de listar, em ordem de chegada, os
+        arquivos de lotes já incluídos no dataset.
+    """
+    folder = batches_dir(path)
+    if not os.path.isdir(folder):
+        return ()
+
+    return tuple(sorted(name for name in os.listdir(folder) if name.endswith('.parquet')))
+
+def dataset_fingerprint(path):
+    """
+        Esta função tem a responsabilidade de identificar uma versão do arquivo
+        de dados através do caminho absoluto, tamanho e data de modificação,
+        além dos lotes incluídos depois dele.
+        Qualquer alteração no arquivo ou lote novo gera uma chave diferente.
+    """
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, list_batches(path))
+
+def columnar_path(path):
+    """
+        Esta função tem a responsabilidade de definir o caminho do arquivo colunar
+        (parquet) gravado ao lado do csv de origem.
+    """
+    return os.path.splitext(path)[0] + '.parquet'
+
+def _source_metadata(path):
+    """
+        Esta função tem a responsabilidade de descrever a versão do csv de origem
+        que é gravada junto do arquivo colunar.
+    """
+    stat = os.stat(path)
+    return json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'schema': SCHEMA_VERSION}).encode()
+
+def prepare_orders(df):
+    """
+        Esta função tem a responsabilidade de transformar pedidos brutos (mesmo
+        formato do train.csv) no formato do dataset: limpeza, colunas derivadas
+        (distância da entrega) e tipos compactos.
+    """
+    df1 = clean_code(df)
+    df1 = add_distance(df1)
+    return compact_schema(df1)
+
+def columnar_schema(df1):
+    """
+        Esta função tem a responsabilidade de definir o schema fixo dos arquivos
+        colunares (csv convertido e lotes), igual em todos os chunks e arquivos,
+        independente do menor tipo que cada pedaço comportaria (ver compact_schema):
+        colunas category como dicionário de textos, inteiros em int16 e decimais
+        em float32. Na leitura, from_columnar volta aos tipos compactos.
+    """
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(df1, preserve_index=False).remove_metadata()
+    types = {col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORY_COLUMNS}
+    types.update({col: pa.int16() for col in INTEGER_COLUMNS})
+    types.update({col: pa.float32() for col in FLOAT_COLUMNS})
+    for col, kind in types.items():
+        position = schema.get_field_index(col)
+        if position >= 0:
+            schema = schema.set(position, pa.field(col, kind))
+
+    return schema
+
+def columnar_table(df1, schema=None):
+    """
+        Esta função tem a responsabilidade de converter pedidos preparados para uma
+        tabela Arrow no schema fixo dos arquivos colunares.
+    """
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df1, schema=schema or columnar_schema(df1), preserve_index=False)
+
+def from_columnar(table):
+    """
+        Esta função tem a responsabilidade de converter uma tabela lida de um arquivo
+        colunar para o formato do dataset: tipos compactos, categorias em ordem
+        alfabética (como o astype('category') da limpeza) e linhas ordenadas por
+        Order_Date (o parquet gravado em chunks só é ordenado dentro de cada chunk).
+    """
+    df1 = compact_schema(table.to_pandas())
+    for col in CATEGORY_COLUMNS:
+        if col in df1.columns:
+            df1[col] = df1[col].cat.reorder_categories(df1[col].cat.categories.sort_values())
+    if not df1['Order_Date'].is_monotonic_increasing:
+        df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+
+    return df1
+
+def _clean_csv(path, workers=1):
+    """
+        Esta função tem a responsabilidade de ler o csv e preparar os pedidos,
+        opcionalmente em vários processos (ver analytics.parallel).
+        As linhas ficam ordenadas por Order_Date para os filtros de data (ver
+        analytics.index).
+    """
+    if workers != 1:
+        from analytics.parallel import clean_parallel
+        return clean_parallel(path, workers)
+
+    df1 = prepare_orders(pd.read_csv(path))
+    return df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+
+def build_columnar_cache(path='dataset/train.csv', workers=1):
+    """
+        Esta função tem a responsabilidade de converter o csv para o arquivo colunar
+        já limpo e tipado. A versão do csv fica registrada nos metadados do parquet
+        para que o arquivo seja refeito automaticamente quando o csv mudar.
+
+        Input: caminho do csv e quantidade de processos da limpeza (padrão 1;
+               None = todos os núcleos, ganho não medido, ver analytics.parallel)
+        Output: dataframe limpo
+    """
+    import pyarrow.parquet as pq
+
+    df1 = _clean_csv(path, workers)
+    table = columnar_table(df1).replace_schema_metadata({SOURCE_METADATA_KEY: _source_metadata(path)})
+
+    # grava em um arquivo temporário para que leitores nunca vejam um parquet pela metade
+    target = columnar_path(path)
+    tmp = '{}.{}.tmp'.format(target, os.getpid())
+    pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, target)
+
+    return df1
+
+def stream_columnar_cache(path='dataset/train.csv', chunksize=200000):
+    """
+        Esta função tem a responsabilidade de converter o csv para o arquivo colunar
+        chunk a chunk (ver analytics.stream.read_clean_chunks), sem carregar o csv
+        inteiro no processo. Usada pelos motores que consultam o parquet direto do
+        disco (DuckDB e Polars).
+
+        Todos os chunks são gravados no schema fixo (ver columnar_schema). Cada
+        chunk é ordenado por Order_Date, mas o arquivo não: os row groups de chunks
+        diferentes podem cobrir as mesmas datas.
+
+        Output: caminho do parquet gravado
+    """
+    import pyarrow.parquet as pq
+
+    metadata = {SOURCE_METADATA_KEY: _source_metadata(path)}
+    target = columnar_path(path)
+    tmp = '{}.{}.tmp'.format(target, os.getpid())
+    writer = None
+    try:
+        for df1 in read_clean_chunks(path, chunksize):
+            df1 = compact_schema(add_distance(df1))
+            df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+            if writer is None:
+                schema = columnar_schema(df1).with_metadata(metadata)
+                writer = pq.ParquetWriter(tmp, schema)
+            writer.write_table(columnar_table(df1, schema), row_group_size=ROW_GROUP_SIZE)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        # nenhuma linha válida: o schema vem da conversão completa (csv vazio)
+        build_columnar_cache(path)
+        return target
+
+    os.replace(tmp, target)
+
+    return target
+
+def _columnar_current(path):
+    """
+        Esta função tem a responsabilidade de verificar se o arquivo colunar existe
+        e corresponde à versão atual do csv.
+    """
+    import pyarrow.parquet as pq
+
+    target = columnar_path(path)
+    if not os.path.exists(target):
+        return False
+
+    metadata = pq.read_schema(target).metadata or {}
+    return metadata.get(SOURCE_METADATA_KEY) == _source_metadata(path)
+
+def _read_columnar(path):
+    """
+        Esta função tem a responsabilidade de ler o arquivo colunar se ele ainda
+        corresponder à versão atual do csv. Retorna None caso contrário.
+    """
+    import pyarrow.parquet as pq
+
+    if not _columnar_current(path):
+        return None
+
+    return from_columnar(pq.read_table(columnar_path(path), memory_map=True))
+
+def columnar_files(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de listar os arquivos colunares da versão
+        atual do dataset (csv limpo seguido dos lotes), refazendo o parquet do csv
+        chunk a chunk quando ele estiver desatualizado. Usada pelos motores que
+        leem o parquet direto do disco.
+    """
+    if not _columnar_current(path):
+        stream_columnar_cache(path)
+
+    folder = batches_dir(path)
+    return [columnar_path(path)] + [os.path.join(folder, name) for name in list_batches(path)]
+
+def _build_base(path):
+    """
+        Esta função tem a responsabilidade de montar o dataset limpo do csv, usando o
+        arquivo colunar quando ele existe e está atualizado. Sem o pyarrow
+        instalado, o csv é lido e limpo diretamente.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return _clean_csv(path)
+
+    df1 = _read_columnar(path)
+    if df1 is not None:
+        return df1
+
+    try:
+        return build_columnar_cache(path)
+    except OSError:
+        # diretório somente leitura: segue sem o arquivo colunar
+        return _clean_csv(path)
+
+def read_batches(path, names):
+    """
+        Esta função tem a responsabilidade de ler os lotes de pedidos já limpos
+        gravados pelo analytics.ingest.
+    """
+    import pyarrow.parquet as pq
+
+    folder = batches_dir(path)
+    frames = [from_columnar(pq.read_table(os.path.join(folder, name), memory_map=True)) for name in names]
+
+    return concat_orders(frames)
+
+def _with_derived_columns(df1):
+    """
+        Esta função tem a responsabilidade de criar as colunas derivadas usadas pelas
+        tabelas (semana do ano), uma vez por versão do dataset, para que nenhuma
+        sessão precise criá-las no próprio recorte.
+    """
+    df1['week_of_year'] = week_of_year(df1['Order_Date'])
+
+    return df1
+
+def _read_only(df1):
+    """
+        Esta função tem a responsabilidade de marcar os arrays do dataset em cache
+        como somente leitura: uma escrita in place feita por uma página levanta
+        erro em vez de alterar o dataset de todas as sessões.
+
+        Colunas do mesmo tipo são juntadas (consolidadas) antes: uma consolidação
+        posterior criaria arrays novos, graváveis. O dataset mapeado da pasta
+        compartilhada não é consolidado (a junção copiaria as colunas para a
+        memória do processo); os arquivos já são abertos somente leitura.
+    """
+    if mapped_arrays(df1)[0] == 0:
+        df1._consolidate_inplace()
+    for values in df1._mgr.arrays:
+        array = getattr(values, '_codes', getattr(values, '_ndarray', values))
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
+    return df1
+
+def _shared_key(fingerprint):
+    """
+        Esta função tem a responsabilidade de identificar a versão do dataset na
+        pasta compartilhada entre processos (ver analytics.shared).
+    """
+    return fingerprint + (SCHEMA_VERSION,)
+
+def _build_dataset(path, fingerprint):
+    """
+        Esta função tem a responsabilidade de montar o dataset completo: o csv
+        limpo seguido dos lotes registrados na versão (fingerprint) informada.
+        Quando outro processo já publicou essa versão na pasta compartilhada, ela
+        é usada diretamente, sem ler nem limpar nada.
+    """
+    df1 = attach(_shared_key(fingerprint))
+    if df1 is not None:
+        return _read_only(df1)
+
+    df1 = _build_base(path)
+    names = fingerprint[-1]
+    if names:
+        df1 = concat_orders([df1, read_batches(path, names)])
+
+    return _read_only(share(_with_derived_columns(df1), _shared_key(fingerprint)))
+
+def _new_batches(old_fingerprint, fingerprint):
+    """
+        Esta função tem a responsabilidade de identificar os lotes que chegaram
+        entre duas versões do dataset. Retorna None quando o csv mudou ou algum
+        lote antigo sumiu, casos em que tudo precisa ser reconstruído.
+    """
+    old_batches, batches = old_fingerprint[-1], fingerprint[-1]
+    if old_fingerprint[:-1] != fingerprint[:-1] or batches[:len(old_batches)] != old_batches:
+        return None
+
+    return batches[len(old_batches):]
+
+def _update_dataset(path, df1, old_fingerprint, fingerprint):
+    """
+        Esta função tem a responsabilidade de acrescentar ao dataset em cache apenas
+        os lotes novos, sem reler nem limpar o histórico.
+    """
+    names = _new_batches(old_fingerprint, fingerprint)
+    if names is None:
+        return None
+
+    shared = attach(_shared_key(fingerprint))
+    if shared is not None:
+        return _read_only(shared)
+
+    df1 = concat_orders([df1, read_batches(path, names)])
+    return _read_only(share(_with_derived_columns(df1), _shared_key(fingerprint)))
+
+def _update_cube(path, cube, old_fingerprint, fingerprint):
+    """
+        Esta função tem a responsabilidade de somar ao cubo em cache o cubo dos
+        lotes novos.
+    """
+    names = _new_batches(old_fingerprint, fingerprint)
+    if names is None:
+        return None
+
+    return merge_cubes(cube, build_cube(read_batches(path, names)))
+
+def _update_sketches(path, sketches, old_fingerprint, fingerprint):
+    """
+        Esta função tem a responsabilidade de juntar aos sketches em cache os
+        sketches dos lotes novos.
+    """
+    names = _new_batches(old_fingerprint, fingerprint)
+    if names is None:
+        return None
+
+    return sketches.merge(CourierSketches.build(read_batches(path, names)))
+
+def _build_cube(path, fingerprint):
+    """
+        Esta função tem a responsabilidade de construir o cubo diário a partir do
+        dataset em cache.
+    """
+    return build_cube(_dataset(path, fingerprint))
+
+def _cached(kind, path, fingerprint, build, update=None):
+    """
+        Esta função tem a responsabilidade de guardar no cache do processo um objeto
+        derivado do arquivo de dados (dataset, cubo, ...). O objeto é construído
+        apenas uma vez por versão (fingerprint) do arquivo; versões antigas são
+        descartadas. Quando existe uma versão antiga e a função update é informada,
+        ela tenta atualizar o objeto de forma incremental antes de reconstruí-lo.
+    """
+    key = (kind,) + fingerprint
+    with _LOCK:
+        value = _CACHE.get(key)
+        if value is None:
+            old_keys = [k for k in _CACHE if k[:2] == key[:2]]
+            if update is not None and old_keys:
+                value = update(path, _CACHE[old_keys[-1]], old_keys[-1][1:], fingerprint)
+            if value is None:
+                value = build(path, fingerprint)
+            for old_key in old_keys:
+                del _CACHE[old_key]
+            _CACHE[key] = value
+
+    return value
+
+def _dataset(path, fingerprint):
+    """
+        Esta função tem a responsabilidade de devolver o dataset em cache (sem cópia).
+    """
+    return _cached('dataset', path, fingerprint, _build_dataset, _update_dataset)
+
+def _cube(path, fingerprint):
+    """
+        Esta função tem a responsabilidade de devolver o cubo diário em cache (sem cópia).
+    """
+    return _cached('cube', path, fingerprint, _build_cube, _update_cube)
+
+def load_dataset(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de carregar o dataset limpo.
+        A leitura e a limpeza acontecem apenas uma vez por versão do arquivo;
+        as demais chamadas (reruns do Streamlit) reutilizam o cache do processo.
+
+        O dataframe em cache é compartilhado por todas as sessões e seus arrays
+        são somente leitura: a página pode criar colunas novas ou filtrar, mas
+        qualquer escrita in place (df1.loc[...] = ..., fillna(inplace=True), ...)
+        levanta ValueError. Para alterar valores, trabalhe sobre uma cópia.
+
+        Input: caminho do csv
+        Output: visão rasa (shallow copy) do dataframe limpo. Novas colunas
+                criadas pela página não alteram o dataframe em cache.
+    """
+    df1 = _dataset(path, dataset_fingerprint(path))
+
+    return df1.copy(deep=False)
+
+def load_cube(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de carregar o cubo diário de pedidos
+        (ver analytics.cube) construído a partir do dataset em cache.
+    """
+    cube = _cube(path, dataset_fingerprint(path))
+
+    return cube.copy(deep=False)
+
+def load_index(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de carregar o índice de data e tráfego
+        (ver analytics.index) sobre o dataset em cache.
+    """
+    return _cached('index', path, dataset_fingerprint(path), lambda p, fp: OrderIndex(_dataset(p, fp)))
+
+def load_cube_index(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de carregar o índice de data e tráfego
+        sobre as células do cubo diário.
+    """
+    return _cached('cube_index', path, dataset_fingerprint(path), lambda p, fp: OrderIndex(_cube(p, fp)))
+
+def load_sketches(path='dataset/train.csv'):
+    """
+        Esta função tem a responsabilidade de carregar os sketches HyperLogLog de
+        entregadores por dia e tráfego (ver analytics.sketch).
+    """
+    return _cached('sketches', path, dataset_fingerprint(path),
+                   lambda p, fp: CourierSketches.build(_dataset(p, fp)), _update_sketches)
+
+def load_spatial_index(path='dataset/train.csv', kind='delivery'):
+    """
+        Esta função tem a responsabilidade de carregar o índice em grade das
+        coordenadas de entrega ('delivery') ou dos restaurantes ('restaurant')
+        (ver analytics.spatial).
+    """
+    return _cached('grid_' + kind, path, dataset_fingerprint(path),
+                   lambda p, fp: GridIndex(_dataset(p, fp), kind))
+
+# ========================== Conversão via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m analytics.loader [dataset/train.csv] [processos]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'dataset/train.csv'
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    df1 = build_columnar_cache(source, processes or None)
+    print('{} linhas gravadas em {}'.format(len(df1), columnar_path(source)))
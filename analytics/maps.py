@@ -0,0 +1,188 @@
+# ==========================
+#         Import's
+# ==========================
+
+import threading
+
+from collections import OrderedDict
+
+import pandas as pd
+
+from analytics import config
+from analytics.loader import load_index, load_spatial_index
+from analytics.spatial import GridIndex
+
+# ==========================
+#        Constant's
+# ==========================
+
+# níveis de detalhe do mapa
+MAP_LEVELS = ['medians', 'restaurants', 'orders']
+
+# acima desta quantidade de pontos os marcadores são sempre agrupados (cluster)
+CLUSTER_THRESHOLD = 500
+
+# ==========================
+#        Class
+# ==========================
+
+class HtmlCache:
+    """
+        Esta classe tem a responsabilidade de guardar os html de mapa mais recentes
+        até um limite de memória: quando o total passa do limite, os html usados há
+        mais tempo são descartados. Um html maior que o limite não é guardado.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            html = self.items.get(key)
+            if html is not None:
+                self.items.move_to_end(key)
+
+        return html
+
+    def put(self, key, html):
+        with self._lock:
+            if key in self.items:
+                self.size -= len(self.items.pop(key))
+            if len(html) <= self.max_bytes:
+                self.items[key] = html
+                self.size += len(html)
+            while self.size > self.max_bytes:
+                _, old = self.items.popitem(last=False)
+                self.size -= len(old)
+
+        return html
+
+# html dos mapas do processo (o texto é ascii, então caracteres ~ bytes)
+_HTML_CACHE = HtmlCache(int(config.MAP_CACHE_MB * 2 ** 20))
+
+# ==========================
+#        Function's
+# ==========================
+
+def grid_points(df1, kind='delivery', grid=None, positions=None):
+    """
+        Esta função tem a responsabilidade de resumir os pedidos em uma marcação por
+        célula da grade (ver analytics.spatial): centro da célula, quantidade de
+        pedidos e tempo médio de entrega. Quando ainda há mais células que
+        config.MAP_MAX_POINTS, ficam as células com mais pedidos.
+
+        Input: pedidos do recorte, coordenadas usadas ('delivery' ou 'restaurant') e,
+               opcionalmente, o índice em grade do dataset em cache com as posições
+               dos pedidos nele (sem eles, a grade é montada sobre df1)
+        Output: Dataframe com as colunas lat, lon e label
+    """
+    if grid is None:
+        grid, positions = GridIndex(df1, kind), None
+    df_aux = grid.cell_stats('Time_taken(min)', positions)
+    df_aux = df_aux.nlargest(config.MAP_MAX_POINTS, 'count', keep='first')
+    label = df_aux['count'].astype(str) + ' pedidos, ' + df_aux['mean'].round(1).astype(str) + ' min em média'
+
+    return pd.DataFrame({'lat': df_aux['lat'].to_numpy(dtype='float64'), 'lon': df_aux['lon'].to_numpy(dtype='float64'),
+                         'label': label.to_numpy()})
+
+def map_points(df1, level='medians', grid=None, positions=None):
+    """
+        Esta função tem a responsabilidade de montar os pontos do mapa:
+        - 'medians': localização central de cada cidade por tipo de tráfego (df1 é
+          a tabela de medianas do motor, ver aggregations.map_medians)
+        - 'restaurants': um ponto por restaurante
+        - 'orders': um ponto por local de entrega
+        Acima de config.MAP_MAX_POINTS pontos, restaurantes e pedidos são resumidos
+        por célula da grade (ver grid_points), para o html não crescer com o recorte.
+        grid e positions são repassados ao grid_points.
+
+        Output: Dataframe com as colunas lat, lon e label
+    """
+    if level == 'medians':
+        df_aux = df1
+        label = df_aux['City'].astype(str) + ' - ' + df_aux['Road_traffic_density'].astype(str)
+        lat, lon = df_aux['Delivery_location_latitude'], df_aux['Delivery_location_longitude']
+    elif level == 'restaurants':
+        df_aux = df1.loc[:, ['Restaurant_latitude', 'Restaurant_longitude', 'City']].drop_duplicates(
+            ['Restaurant_latitude', 'Restaurant_longitude'])
+        if len(df_aux) > config.MAP_MAX_POINTS:
+            return grid_points(df1, 'restaurant', grid, positions)
+        label = df_aux['City'].astype(str)
+        lat, lon = df_aux['Restaurant_latitude'], df_aux['Restaurant_longitude']
+    elif level == 'orders':
+        if len(df1) > config.MAP_MAX_POINTS:
+            return grid_points(df1, 'delivery', grid, positions)
+        df_aux = df1
+        label = df_aux['ID']
+        lat, lon = df_aux['Delivery_location_latitude'], df_aux['Delivery_location_longitude']
+    else:
+        raise ValueError('level deve ser um de {}'.format(MAP_LEVELS))
+
+    return pd.DataFrame({'lat': lat.to_numpy(dtype='float64'), 'lon': lon.to_numpy(dtype='float64'),
+                         'label': label.to_numpy()})
+
+def build_map_html(points, clustered=False):
+    """
+        Esta função tem a responsabilidade de gerar o html do mapa folium.
+        Sem cluster, cada ponto vira um marcador com popup; com cluster, os pontos
+        são enviados como uma única lista e agrupados no navegador.
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    map = folium.Map()
+    if clustered or len(points) > CLUSTER_THRESHOLD:
+        FastMarkerCluster(points[['lat', 'lon']].to_numpy().tolist()).add_to(map)
+    else:
+        for lat, lon, label in zip(points['lat'].tolist(), points['lon'].tolist(), points['label'].tolist()):
+            folium.Marker([lat, lon], popup=str(label)).add_to(map)
+
+    if len(points) > 0:
+        map.fit_bounds([[points['lat'].min(), points['lon'].min()],
+                        [points['lat'].max(), points['lon'].max()]])
+
+    return folium.Figure().add_child(map).render()
+
+def _country_map_html(engine, start, end, traffic_options, level, clustered):
+    """
+        Esta função tem a responsabilidade de gerar o html do mapa para um estado
+        dos filtros.
+    """
+    if level == 'medians':
+        return build_map_html(map_points(engine.map_medians(start, end, list(traffic_options)), level), clustered)
+
+    # restaurantes e pedidos: recorte pelo índice de datas e células pelo índice
+    # em grade em cache, os dois sobre o mesmo dataframe do processo
+    index = load_index(engine.path)
+    positions = index.positions(start, end, list(traffic_options))
+    grid = load_spatial_index(engine.path, 'restaurant' if level == 'restaurants' else 'delivery')
+    if grid.frame is not index.frame:
+        # nova versão do dataset entre as duas leituras: a grade é montada sobre o recorte
+        grid = None
+    # cópia rasa: o recorte direto do dataframe em cache consolidaria os blocos dele
+    df1 = index.frame.copy(deep=False).iloc[positions]
+
+    return build_map_html(map_points(df1, level, grid, positions), clustered)
+
+def country_map_html(engine, fingerprint, start, end, traffic_options, level='medians', clustered=False):
+    """
+        Esta função tem a responsabilidade de devolver o html do mapa da visão
+        geográfica. As medianas vêm do motor das agregações (CURRY_ENGINE); só os
+        níveis de restaurantes e pedidos leem as linhas do dataset. Reruns com os
+        mesmos filtros (ou em outra aba) reutilizam o html já gerado em vez de
+        refazer e serializar o mapa; o cache é limitado pelo tamanho dos html
+        (config.MAP_CACHE_MB) e a versão do dataset (fingerprint) faz parte da chave.
+
+        Input: motor das agregações, versão do dataset, filtros da sidebar, nível
+               de detalhe e se os marcadores devem ser agrupados
+        Output: html do mapa
+    """
+    key = (engine, fingerprint, pd.Timestamp(start), pd.Timestamp(end), tuple(sorted(traffic_options)), level, clustered)
+    html = _HTML_CACHE.get(key)
+    if html is None:
+        html = _HTML_CACHE.put(key, _country_map_html(engine, *key[2:]))
+
+    return html
@@ -0,0 +1,164 @@
+# ==========================
+#         Import's
+# ==========================
+
+import json
+import logging
+import os
+import threading
+import time
+
+from analytics import config
+
+# ==========================
+#        Constant's
+# ==========================
+
+logger = logging.getLogger('curry_company.profiling')
+
+_LOGGER_LOCK = threading.Lock()
+_logger_ready = False
+
+# ==========================
+#        Function's
+# ==========================
+
+def _configure_logger():
+    """
+        Esta função tem a responsabilidade de preparar o logger das medições na
+        primeira página medida, e não no import do módulo. O streamlit não
+        configura loggers fora do próprio pacote, então um handler no stderr é
+        criado apenas quando nem este logger nem o logger raiz (configuração da
+        aplicação) têm handlers.
+    """
+    global _logger_ready
+
+    with _LOGGER_LOCK:
+        if _logger_ready:
+            return
+        if logger.level == logging.NOTSET:
+            logger.setLevel(logging.INFO)
+        if not logger.handlers and not logging.getLogger().handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+            logger.addHandler(handler)
+            logger.propagate = False
+        _logger_ready = True
+
+def rss_bytes():
+    """
+        Esta função tem a responsabilidade de ler a memória residente atual do
+        processo (Linux: /proc/self/statm; outros sistemas: pico via resource).
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# ==========================
+#        Class
+# ==========================
+
+class _Section:
+    """
+        Esta classe tem a responsabilidade de medir uma seção da página: tempo,
+        variação da memória residente e quantidade de linhas (informada no bloco
+        com section.rows = ...).
+    """
+
+    __slots__ = ('profiler', 'name', 'rows', 'seconds', 'memory', '_start', '_rss')
+
+    def __init__(self, profiler, name, rows=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._rss = rss_bytes()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self.memory = rss_bytes() - self._rss
+        self.profiler.sections.append(self)
+        return False
+
+class _NullSection:
+    """
+        Esta classe tem a responsabilidade de substituir a seção quando a medição
+        está desligada: não mede nada e aceita section.rows sem efeito.
+    """
+
+    __slots__ = ('rows',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class PageProfiler:
+    """
+        Esta classe tem a responsabilidade de medir as seções de uma execução
+        (rerun) de uma página: leitura, filtros, cada agregação, figuras e mapa.
+        Desligada (padrão), cada seção custa apenas a chamada de um método.
+
+        Uso:
+            profiler = PageProfiler('visao_empresa')
+            with profiler.section('filter') as section:
+                df1 = ...
+                section.rows = len(df1)
+            profiler.finish()
+    """
+
+    def __init__(self, page, enabled=None):
+        self.page = page
+        self.enabled = config.PROFILE if enabled is None else enabled
+        self.sections = []
+        if self.enabled:
+            _configure_logger()
+        self.started = time.perf_counter() if self.enabled else None
+
+    def section(self, name, rows=None):
+        """
+            Esta função tem a responsabilidade de abrir o bloco de medição de uma seção.
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+
+        return _Section(self, name, rows)
+
+    def records(self):
+        """
+            Esta função tem a responsabilidade de devolver as medições da execução.
+
+            Output: lista de dicionários com seção, milissegundos, linhas e variação
+                    de memória (MB)
+        """
+        return [{'section': s.name, 'ms': round(s.seconds * 1000, 2), 'rows': s.rows,
+                 'memory_mb': round(s.memory / 2 ** 20, 2)} for s in self.sections]
+
+    def total_ms(self):
+        """
+            Esta função tem a responsabilidade de medir o tempo total da execução até agora.
+        """
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def finish(self):
+        """
+            Esta função tem a responsabilidade de registrar uma linha de log estruturada
+            (json) com todas as seções da execução.
+        """
+        if not self.enabled:
+            return None
+
+        line = {'page': self.page, 'total_ms': self.total_ms(), 'rss_mb': round(rss_bytes() / 2 ** 20, 1),
+                'sections': self.records()}
+        logger.info(json.dumps(line))
+
+        return line
@@ -0,0 +1,75 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+from analytics.cube import plain_keys
+
+# ==========================
+#        Function's
+# ==========================
+
+def _select_k(values, ids, k, ascending):
+    """
+        Esta função tem a responsabilidade de escolher as posições dos k menores
+        (ou maiores) valores com seleção parcial (partition) e ordenar só esses k.
+        Empates são desfeitos pela ordem do entregador (ids), como nos demais
+        motores: entram todos os empatados com o k-ésimo valor e ficam os primeiros.
+    """
+    if not ascending:
+        values = -values
+    if k < len(values):
+        kth = np.partition(values, k - 1)[k - 1]
+        positions = np.flatnonzero(values <= kth)
+    else:
+        positions = np.arange(len(values))
+
+    return positions[np.lexsort((ids[positions], values[positions]))[:k]]
+
+def rank_couriers(df1, k=10):
+    """
+        Esta função tem a responsabilidade de mostrar os top k entregadores
+        mais rápidos e mais lentos de cada cidade presente nos dados.
+        O tempo médio por (cidade, entregador) é calculado em um único groupby e,
+        dentro de cada cidade, os k extremos são escolhidos por seleção parcial,
+        sem ordenar todos os entregadores.
+
+        Input: Dataframe e quantidade k de entregadores por cidade
+        Output: (mais rápidos, mais lentos), cada um com as colunas
+                City, Delivery_person_ID e Time_taken(min)
+    """
+    df2 = (df1.loc[:, ['Delivery_person_ID', 'City', 'Time_taken(min)']]
+              .groupby(['City', 'Delivery_person_ID'], observed=True)
+              .mean()
+              .reset_index())
+
+    return rank_by_city(df2, k)
+
+def rank_by_city(df2, k=10):
+    """
+        Esta função tem a responsabilidade de escolher, dentro de cada cidade, os k
+        menores e os k maiores tempos médios já calculados por entregador.
+
+        Input: Dataframe com as colunas City, Delivery_person_ID e Time_taken(min),
+               agrupado por City (cidades em blocos contíguos)
+        Output: (mais rápidos, mais lentos); empates ordenados por Delivery_person_ID
+    """
+    values = df2['Time_taken(min)'].to_numpy(dtype='float64')
+    ids = pd.factorize(df2['Delivery_person_ID'].astype(str), sort=True)[0]
+
+    # o groupby devolve as cidades em blocos contíguos
+    city_codes = pd.factorize(df2['City'])[0]
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(city_codes)) + 1, [len(df2)]])
+
+    fastest, slowest = [], []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end > start:
+            fastest.append(start + _select_k(values[start:end], ids[start:end], k, ascending=True))
+            slowest.append(start + _select_k(values[start:end], ids[start:end], k, ascending=False))
+
+    df_fastest = plain_keys(df2.iloc[np.concatenate(fastest or [[]]).astype(np.intp)].reset_index(drop=True))
+    df_slowest = plain_keys(df2.iloc[np.concatenate(slowest or [[]]).astype(np.intp)].reset_index(drop=True))
+
+    return df_fastest, df_slowest
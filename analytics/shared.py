@@ -0,0 +1,249 @@
+# ==========================
+#         Import's
+# ==========================
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics import config
+
+# ==========================
+#        Constant's
+# ==========================
+
+# versão do formato da cópia compartilhada; incrementar ao mudar a forma de gravar
+STORE_VERSION = 1
+
+COLUMNS_FILE = 'columns.json'
+
+# ==========================
+#        Function's
+# ==========================
+
+def _digest(value, size):
+    """
+        Esta função tem a responsabilidade de gerar um nome curto de pasta para um valor.
+    """
+    return hashlib.sha1(repr(value).encode()).hexdigest()[:size]
+
+def store_root():
+    """
+        Esta função tem a responsabilidade de definir a pasta das cópias
+        compartilhadas (CURRY_SHARED_DIR). Retorna None quando desligado.
+    """
+    if not config.SHARED_DIR:
+        return None
+
+    return os.path.join(config.SHARED_DIR, 'curry_company')
+
+def store_path(key):
+    """
+        Esta função tem a responsabilidade de definir a pasta de uma versão do
+        dataset: uma pasta por arquivo de origem (key[0], caminho absoluto) e uma
+        subpasta por versão (demais itens da chave).
+    """
+    return os.path.join(store_root(), _digest(key[0], 12), _digest((STORE_VERSION,) + tuple(key[1:]), 16))
+
+def _save_strings(values, target):
+    """
+        Esta função tem a responsabilidade de gravar uma coluna de textos como um
+        arquivo Arrow IPC, que é lido de volta sem cópia (ver attach).
+        Retorna False quando a coluna não é só de textos ou o pyarrow não existe.
+    """
+    try:
+        import pyarrow as pa
+
+        table = pa.table({'values': pa.array(values.to_numpy(), type=pa.string(), from_pandas=True)})
+    except (ImportError, TypeError, ValueError):
+        return False
+
+    with pa.OSFile(target, 'wb') as file:
+        with pa.ipc.new_file(file, table.schema) as writer:
+            writer.write_table(table)
+
+    return True
+
+def _save_column(values, folder, position):
+    """
+        Esta função tem a responsabilidade de gravar uma coluna e descrever como
+        ela deve ser aberta:
+        - 'array': números e datas, um .npy;
+        - 'category': códigos em um .npy e categorias em outro;
+        - 'string': textos com muitos valores distintos (como o ID do pedido), em
+          Arrow, abertos como string[pyarrow].
+        Textos com poucos valores distintos viram category.
+    """
+    column = {'kind': 'array', 'file': '{}.npy'.format(position)}
+    if values.dtype == object:
+        if values.nunique() > len(values) // 2:
+            column = {'kind': 'string', 'file': '{}.arrow'.format(position)}
+            if _save_strings(values, os.path.join(folder, column['file'])):
+                return column
+        values = values.astype('category')
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        column = {'kind': 'category', 'file': '{}.npy'.format(position),
+                  'categories': '{}.categories.npy'.format(position), 'ordered': bool(values.cat.ordered)}
+        categories = np.asarray(values.cat.categories.tolist())
+        np.save(os.path.join(folder, column['categories']), categories, allow_pickle=False)
+        values = values.cat.codes
+    np.save(os.path.join(folder, column['file']), values.to_numpy(), allow_pickle=False)
+
+    return column
+
+def _open_column(column, folder):
+    """
+        Esta função tem a responsabilidade de abrir uma coluna gravada por
+        _save_column sem copiar os dados.
+    """
+    target = os.path.join(folder, column['file'])
+    if column['kind'] == 'string':
+        import pyarrow as pa
+
+        values = pa.ipc.open_file(pa.memory_map(target)).read_all().column('values')
+        return pd.arrays.ArrowStringArray(values)
+
+    values = np.load(target, mmap_mode='r')
+    if column['kind'] == 'category':
+        categories = pd.Index(np.load(os.path.join(folder, column['categories'])))
+        if categories.dtype.kind == 'U':
+            categories = categories.astype(object)
+        values = pd.Categorical.from_codes(values, categories=categories, ordered=column['ordered'])
+
+    return values
+
+def mapped_arrays(df1):
+    """
+        Esta função tem a responsabilidade de contar os arrays numpy do dataframe
+        que continuam mapeados dos arquivos compartilhados (np.memmap). Colunas
+        em Arrow não entram na conta.
+
+        Output: (arrays mapeados, total de arrays numpy)
+    """
+    mapped, total = 0, 0
+    for values in df1._mgr.arrays:
+        array = getattr(values, '_codes', getattr(values, '_ndarray', values))
+        if not isinstance(array, np.ndarray):
+            continue
+        total += 1
+        while array is not None and not isinstance(array, np.memmap):
+            array = getattr(array, 'base', None)
+        mapped += array is not None
+
+    return mapped, total
+
+def publish(df1, key):
+    """
+        Esta função tem a responsabilidade de gravar o dataframe na pasta
+        compartilhada, um arquivo por coluna (ver _save_column), para que todos os
+        processos do servidor mapeiem os mesmos arquivos em memória. Versões
+        mais velhas do mesmo arquivo de origem são apagadas (processos que ainda
+        as usam continuam com o mapeamento).
+
+        Input: dataframe limpo e chave da versão (ver loader)
+        Output: pasta gravada
+    """
+    target = store_path(key)
+    if os.path.exists(os.path.join(target, COLUMNS_FILE)):
+        return target
+
+    tmp = '{}.{}.tmp'.format(target, os.getpid())
+    os.makedirs(tmp, exist_ok=True)
+    columns = []
+    for position, col in enumerate(df1.columns):
+        column = _save_column(df1[col], tmp, position)
+        column['name'] = col
+        columns.append(column)
+
+    with open(os.path.join(tmp, COLUMNS_FILE), 'w') as file:
+        json.dump(columns, file)
+
+    # a pasta completa aparece de uma vez; se outro processo publicou antes, vale a dele
+    try:
+        os.rename(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    folder = os.path.dirname(target)
+    published = os.path.getmtime(target)
+    for name in os.listdir(folder):
+        old = os.path.join(folder, name)
+        if old != target and not name.endswith('.tmp') and os.path.getmtime(old) < published:
+            shutil.rmtree(old, ignore_errors=True)
+
+    return target
+
+def attach(key):
+    """
+        Esta função tem a responsabilidade de abrir a versão publicada do dataset
+        sem copiar os dados: cada coluna é um array somente leitura mapeado do
+        arquivo, compartilhado com os demais processos.
+
+        O dataframe fica com um bloco por coluna e não pode ser consolidado sem
+        copiar os dados: recortes de linhas (iloc/take) devem ser feitos sobre uma
+        cópia rasa (ver GridIndex.rows), nunca direto sobre o dataframe em cache.
+        mapped_arrays verifica se as colunas continuam mapeadas.
+
+        Output: dataframe ou None quando a versão não foi publicada
+    """
+    if store_root() is None:
+        return None
+
+    target = store_path(key)
+    try:
+        with open(os.path.join(target, COLUMNS_FILE)) as file:
+            columns = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    data = {column['name']: _open_column(column, target) for column in columns}
+
+    return pd.DataFrame(data, copy=False)
+
+def share(df1, key):
+    """
+        Esta função tem a responsabilidade de trocar o dataframe do processo pela
+        versão compartilhada (publicando-a, se ainda não existir). Sem a pasta
+        compartilhada configurada ou sem permissão de escrita, segue com o
+        dataframe do processo.
+    """
+    if store_root() is None:
+        return df1
+
+    try:
+        publish(df1, key)
+    except OSError:
+        return df1
+
+    shared = attach(key)
+    return df1 if shared is None else shared
+
+def clear():
+    """
+        Esta função tem a responsabilidade de apagar todas as cópias compartilhadas.
+    """
+    root = store_root()
+    if root is not None:
+        shutil.rmtree(root, ignore_errors=True)
+
+# ========================== Publicação via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: CURRY_SHARED_DIR=/dev/shm python -m analytics.shared [dataset/train.csv] [--clear]
+    from analytics.loader import load_dataset
+
+    if store_root() is None:
+        sys.exit('defina CURRY_SHARED_DIR (por exemplo /dev/shm)')
+    if '--clear' in sys.argv:
+        clear()
+        sys.exit(0)
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    df1 = load_dataset(args[0] if args else 'dataset/train.csv')
+    print('{} linhas compartilhadas em {}'.format(len(df1), store_root()))
@@ -0,0 +1,186 @@
+# ==========================
+#         Import's
+# ==========================
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from analytics import config
+
+# ==========================
+#        Function's
+# ==========================
+
+def precision_for_error(error):
+    """
+        Esta função tem a responsabilidade de escolher a precisão p do HyperLogLog
+        (2^p registradores) para o erro relativo desejado: erro ~ 1.04 / sqrt(2^p).
+    """
+    p = math.ceil(math.log2((1.04 / error) ** 2))
+
+    return min(max(p, 11), 18)
+
+def hash_values(values):
+    """
+        Esta função tem a responsabilidade de gerar um hash de 64 bits por valor.
+        O hash é calculado uma vez por valor distinto e replicado pelos códigos do factorize.
+    """
+    codes, uniques = pd.factorize(values)
+    hashes = pd.util.hash_array(np.asarray(uniques, dtype=object))
+
+    return hashes[codes]
+
+def _register_updates(hashes, p):
+    """
+        Esta função tem a responsabilidade de calcular, para cada hash, o registrador
+        (p bits mais altos) e o rank (posição do primeiro bit 1 nos bits restantes).
+    """
+    bits = 64 - p
+    index = (hashes >> np.uint64(bits)).astype(np.intp)
+    rest = (hashes & np.uint64((1 << bits) - 1)).astype('float64')
+    # com p >= 11 os bits restantes cabem na mantissa do float64: frexp é exato
+    _, bit_length = np.frexp(rest)
+    rank = (bits - bit_length + 1).astype(np.uint8)
+
+    return index, rank
+
+def estimate(registers):
+    """
+        Esta função tem a responsabilidade de estimar a cardinalidade a partir dos
+        registradores, com a correção de linear counting para conjuntos pequenos.
+    """
+    registers = np.asarray(registers)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)), axis=-1)
+    zeros = np.count_nonzero(registers == 0, axis=-1)
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+
+    return np.round(np.where(small, linear, raw)).astype(np.int64)
+
+# ==========================
+#        Class
+# ==========================
+
+class CourierSketches:
+    """
+        Esta classe tem a responsabilidade de guardar sketches HyperLogLog dos
+        entregadores (Delivery_person_ID) por dia e por tipo de tráfego.
+        A quantidade de entregadores únicos de qualquer intervalo de datas e
+        combinação de tráfego é estimada juntando (máximo elemento a elemento)
+        poucos sketches pequenos, sem voltar às linhas.
+
+        registers: array (dias x tráfegos x 2^p) de uint8
+    """
+
+    def __init__(self, dates, traffic, registers, p):
+        self.dates = dates
+        self.traffic = list(traffic)
+        self.registers = registers
+        self.p = p
+
+    @classmethod
+    def build(cls, df1, error=None):
+        """
+            Esta função tem a responsabilidade de construir os sketches a partir do
+            dataset limpo.
+        """
+        p = precision_for_error(error or config.HLL_ERROR)
+        day_codes, dates = pd.factorize(df1['Order_Date'], sort=True)
+        traffic_codes, traffic = pd.factorize(df1['Road_traffic_density'], sort=True)
+
+        registers = np.zeros((len(dates), len(traffic), 1 << p), dtype=np.uint8)
+        index, rank = _register_updates(hash_values(df1['Delivery_person_ID']), p)
+        np.maximum.at(registers, (day_codes, traffic_codes, index), rank)
+
+        return cls(np.asarray(dates, dtype='datetime64[ns]'), np.asarray(traffic), registers, p)
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(1 << self.p)
+
+    def merge(self, other):
+        """
+            Esta função tem a responsabilidade de juntar sketches de lotes diferentes
+            de pedidos (mesma precisão).
+        """
+        dates = np.union1d(self.dates, other.dates)
+        traffic = sorted(set(self.traffic) | set(other.traffic))
+        registers = np.zeros((len(dates), len(traffic), 1 << self.p), dtype=np.uint8)
+        for sketch in (self, other):
+            rows = np.searchsorted(dates, sketch.dates)
+            cols = [traffic.index(value) for value in sketch.traffic]
+            target = registers[np.ix_(rows, cols)]
+            registers[np.ix_(rows, cols)] = np.maximum(target, sketch.registers)
+
+        return CourierSketches(dates, traffic, registers, self.p)
+
+    def _select(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de recortar os sketches do intervalo
+            start <= data < end e dos tipos de tráfego selecionados.
+        """
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, 'ns'))
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end, 'ns'))
+        cols = [i for i, value in enumerate(self.traffic)
+                if traffic_options is None or value in traffic_options]
+
+        return self.dates[lo:hi], self.registers[lo:hi][:, cols]
+
+    def unique(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de estimar os entregadores únicos do recorte.
+        """
+        _, registers = self._select(start, end, traffic_options)
+        if registers.size == 0:
+            return 0
+
+        return int(estimate(registers.max(axis=(0, 1))))
+
+    def unique_by_week(self, start=None, end=None, traffic_options=None):
+        """
+            Esta função tem a responsabilidade de estimar os entregadores únicos por
+            semana do ano ('%U') dentro do recorte.
+        """
+        dates, registers = self._select(start, end, traffic_options)
+        weeks = pd.DatetimeIndex(dates).strftime('%U')
+        rows = []
+        for week in pd.unique(weeks):
+            merged = registers[weeks == week].max(axis=(0, 1)) if registers.shape[1] else None
+            rows.append({'week_of_year': week,
+                         'Delivery_person_ID': 0 if merged is None else int(estimate(merged))})
+
+        return pd.DataFrame(rows, columns=['week_of_year', 'Delivery_person_ID'])
+
+# ==========================
+#        Function's
+# ==========================
+
+def unique_couriers(df1, sketches=None, start=None, end=None, traffic_options=None):
+    """
+        Esta função tem a responsabilidade de contar os entregadores únicos do recorte.
+        No modo 'hll' usa os sketches; no modo 'exact' (ou sem sketches) usa nunique
+        sobre o dataframe já filtrado.
+    """
+    if config.DISTINCT_MODE == 'exact' or sketches is None:
+        return df1['Delivery_person_ID'].nunique()
+
+    return sketches.unique(start, end, traffic_options)
+
+def couriers_by_week(df1, sketches=None, start=None, end=None, traffic_options=None):
+    """
+        Esta função tem a responsabilidade de contar os entregadores únicos por semana.
+        No modo 'hll' usa os sketches; no modo 'exact' (ou sem sketches) usa nunique
+        sobre o dataframe já filtrado.
+    """
+    if config.DISTINCT_MODE == 'exact' or sketches is None:
+        if 'week_of_year' in df1.columns:
+            week_of_year = df1['week_of_year']
+        else:
+            week_of_year = df1['Order_Date'].dt.strftime('%U').rename('week_of_year')
+        return df1['Delivery_person_ID'].groupby(week_of_year, observed=True).nunique().reset_index()
+
+    return sketches.unique_by_week(start, end, traffic_options)
@@ -0,0 +1,148 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+
+from analytics.geo import haversine_km
+
+# ==========================
+#        Constant's
+# ==========================
+
+# pares de colunas de coordenadas que podem ser indexados
+COORDINATES = {'delivery': ('Delivery_location_latitude', 'Delivery_location_longitude'),
+               'restaurant': ('Restaurant_latitude', 'Restaurant_longitude')}
+
+# tamanho padrão da célula em graus (~5,5 km de latitude)
+CELL_SIZE = 0.05
+
+# deslocamento que deixa os índices de linha/coluna positivos na chave da célula
+CELL_OFFSET = 1 << 30
+
+# quilômetros por grau de latitude
+KM_PER_DEGREE = 111.195
+
+# ==========================
+#        Class
+# ==========================
+
+class GridIndex:
+    """
+        Esta classe tem a responsabilidade de indexar os pedidos em uma grade regular
+        de latitude/longitude. As linhas ficam agrupadas por célula (estrutura CSR:
+        células ordenadas, início de cada célula e posições das linhas), então
+        consultas por retângulo ou raio só olham as células que tocam a área.
+    """
+
+    def __init__(self, df1, kind='delivery', cell_size=CELL_SIZE):
+        self.frame = df1
+        self.kind = kind
+        self.cell_size = cell_size
+        lat_col, lon_col = COORDINATES[kind]
+        self.lat = df1[lat_col].to_numpy(dtype='float64')
+        self.lon = df1[lon_col].to_numpy(dtype='float64')
+
+        keys = self._keys(self._cell(self.lat), self._cell(self.lon))
+        self.order = np.argsort(keys, kind='stable')
+        self.cells, self.starts = np.unique(keys[self.order], return_index=True)
+        self.ends = np.append(self.starts[1:], len(keys))
+
+    def _cell(self, degrees):
+        return np.floor(np.asarray(degrees) / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(rows, cols):
+        # linha e coluna da célula combinadas em um único inteiro positivo (ordem: linha, coluna)
+        return ((rows + CELL_OFFSET) << 32) | (cols + CELL_OFFSET)
+
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """
+            Esta função tem a responsabilidade de listar as posições das linhas das
+            células que tocam o retângulo. Cada linha da grade é um trecho contíguo
+            das células ordenadas, localizado por busca binária.
+        """
+        col_min, col_max = self._cell(lon_min), self._cell(lon_max)
+        chunks = []
+        for row in range(self._cell(lat_min), self._cell(lat_max) + 1):
+            row = np.int64(row)
+            lo = np.searchsorted(self.cells, self._keys(row, col_min), side='left')
+            hi = np.searchsorted(self.cells, self._keys(row, col_max), side='right')
+            if hi > lo:
+                chunks.append(self.order[self.starts[lo]:self.ends[hi - 1]])
+
+        return np.concatenate(chunks) if chunks else np.array([], dtype=np.intp)
+
+    def bbox_positions(self, lat_min, lat_max, lon_min, lon_max):
+        """
+            Esta função tem a responsabilidade de devolver as posições das linhas
+            dentro do retângulo (limites inclusivos).
+        """
+        positions = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        lat, lon = self.lat[positions], self.lon[positions]
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+
+        return np.sort(positions[inside])
+
+    def radius_positions(self, lat, lon, radius_km):
+        """
+            Esta função tem a responsabilidade de devolver as posições das linhas a
+            até radius_km do ponto (distância de haversine). O retângulo das células
+            candidatas é o que contém a calota esférica inteira: a largura em
+            longitude é asin(sen(raio) / cos(lat)), maior que raio / cos(lat) longe
+            do equador. Longitudes não dão a volta em ±180 graus.
+        """
+        dlat = radius_km / KM_PER_DEGREE
+        ratio = np.sin(np.radians(dlat)) / np.cos(np.radians(lat))
+        if abs(lat) + dlat >= 90 or ratio >= 1:
+            # a calota alcança um polo: todas as longitudes
+            lon_min, lon_max = -180.0, 180.0
+        else:
+            dlon = np.degrees(np.arcsin(ratio))
+            lon_min, lon_max = lon - dlon, lon + dlon
+        positions = self._candidates(lat - dlat, lat + dlat, lon_min, lon_max)
+        distance = haversine_km(lat, lon, self.lat[positions], self.lon[positions])
+
+        return np.sort(positions[distance <= radius_km])
+
+    def rows(self, positions):
+        """
+            Esta função tem a responsabilidade de devolver as linhas nas posições
+            informadas. O recorte é feito sobre uma cópia rasa: tirar linhas direto
+            do dataframe em cache faria o pandas consolidar os blocos dele em arrays
+            novos (graváveis e fora da memória compartilhada).
+        """
+        return self.frame.copy(deep=False).iloc[positions]
+
+    def bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """
+            Esta função tem a responsabilidade de devolver os pedidos dentro do retângulo.
+        """
+        return self.rows(self.bbox_positions(lat_min, lat_max, lon_min, lon_max))
+
+    def radius(self, lat, lon, radius_km):
+        """
+            Esta função tem a responsabilidade de devolver os pedidos a até radius_km
+            do ponto, por exemplo entregas a menos de 5 km de um restaurante.
+        """
+        return self.rows(self.radius_positions(lat, lon, radius_km))
+
+    def cell_stats(self, value='Time_taken(min)', positions=None):
+        """
+            Esta função tem a responsabilidade de agregar os pedidos por célula:
+            centro da célula, quantidade de pedidos e média/desvio padrão da coluna.
+            Com positions (resultado de uma consulta), agrega apenas essas linhas.
+        """
+        if positions is None:
+            positions = self.order
+        keys = self._keys(self._cell(self.lat[positions]), self._cell(self.lon[positions]))
+        values = self.frame[value].to_numpy(dtype='float64')[positions]
+
+        df_aux = pd.Series(values).groupby(keys).agg(['count', 'mean', 'std'])
+        rows = (df_aux.index.to_numpy() >> 32) - CELL_OFFSET
+        cols = (df_aux.index.to_numpy() & 0xFFFFFFFF) - CELL_OFFSET
+        df_aux.insert(0, 'lat', (rows + 0.5) * self.cell_size)
+        df_aux.insert(1, 'lon', (cols + 0.5) * self.cell_size)
+
+        return df_aux.reset_index(drop=True)
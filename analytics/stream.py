@@ -0,0 +1,171 @@
+# ==========================
+#         Import's
+# ==========================
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics.aggregations import metric_values
+from analytics.cleaning import clean_code
+
+# ==========================
+#        Class
+# ==========================
+
+class PartialAggregate:
+    """
+        Esta classe tem a responsabilidade de acumular estatísticas de uma coluna
+        numérica por grupo de forma combinável: quantidade, soma, soma dos quadrados,
+        mínimo e máximo. Agregados parciais de pedaços (chunks) diferentes do csv
+        podem ser somados com merge e o resultado é o mesmo de agrupar todas as
+        linhas de uma vez.
+    """
+
+    # como combinar cada estatística entre grupos e chunks
+    STATS = {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'}
+
+    def __init__(self, by, value):
+        self.by = list(by)
+        self.value = value
+        self.frame = None
+
+    def partial(self, df1):
+        """
+            Esta função tem a responsabilidade de calcular o agregado de um chunk.
+        """
+        values = df1[self.value].astype('float64')
+        df_aux = pd.DataFrame({'count': 1, 'sum': values, 'sumsq': values * values,
+                               'min': values, 'max': values})
+        if self.by:
+            keys = [df1[col] for col in self.by]
+            return df_aux.groupby(keys, observed=True).agg(self.STATS)
+
+        return df_aux.agg(self.STATS).to_frame().T
+
+    def merge(self, frame):
+        """
+            Esta função tem a responsabilidade de somar um agregado parcial ao acumulado.
+        """
+        if self.frame is None:
+            self.frame = frame
+            return self
+
+        df_aux = pd.concat([self.frame, frame])
+        level = list(range(df_aux.index.nlevels))
+        self.frame = df_aux.groupby(level=level).agg(self.STATS)
+        return self
+
+    def update(self, df1):
+        """
+            Esta função tem a responsabilidade de acumular um chunk já limpo.
+        """
+        return self.merge(self.partial(df1))
+
+    def result(self):
+        """
+            Esta função tem a responsabilidade de finalizar as estatísticas:
+            quantidade, média, desvio padrão amostral (como o pandas), mínimo e máximo.
+        """
+        if self.frame is None:
+            index = pd.MultiIndex.from_arrays([[]] * len(self.by), names=self.by) if self.by else None
+            return pd.DataFrame(columns=['count', 'mean', 'std', 'min', 'max'], index=index, dtype='float64')
+
+        df_aux = self.frame.copy()
+        n = df_aux['count']
+        df_aux['mean'] = df_aux['sum'] / n
+        variance = (df_aux['sumsq'] - df_aux['sum'] ** 2 / n) / (n - 1)
+        df_aux['std'] = np.sqrt(variance.clip(lower=0).where(n > 1))
+        df_aux.index.names = self.by or [None]
+
+        return df_aux.loc[:, ['count', 'mean', 'std', 'min', 'max']]
+
+# ==========================
+#        Function's
+# ==========================
+
+def read_clean_chunks(path, chunksize=200000):
+    """
+        Esta função tem a responsabilidade de ler o csv em pedaços (chunks) e aplicar
+        as regras do clean_code em cada um, sem carregar o arquivo inteiro.
+    """
+    for df in pd.read_csv(path, chunksize=chunksize):
+        df1 = clean_code(df)
+        if len(df1) > 0:
+            yield df1
+
+def _add_week_of_year(df1):
+    """
+        Esta função tem a responsabilidade de criar a semana do ano ('%U') calculando
+        o strftime apenas uma vez por data distinta do chunk.
+    """
+    codes, uniques = pd.factorize(df1['Order_Date'])
+    df1['week_of_year'] = np.asarray(uniques.strftime('%U'))[codes]
+
+    return df1
+
+def stream_aggregates(path, chunksize=200000, start=None, end=None, traffic_options=None):
+    """
+        Esta função tem a responsabilidade de calcular, em modo streaming, as tabelas
+        das páginas que não dependem de ter todas as linhas em memória.
+        A memória usada depende do tamanho do chunk e da quantidade de grupos,
+        não do tamanho do csv.
+
+        Input: caminho do csv, tamanho do chunk e os mesmos filtros da sidebar
+               (start <= data < end e tipos de tráfego)
+        Output: dicionário com as tabelas:
+                - 'order_metric': pedidos por dia
+                - 'order_by_week': pedidos por semana
+                - 'avg_std_time_graph': tempo médio e desvio padrão por cidade
+                - 'avg_std_time_on_traffic': tempo médio e desvio padrão por cidade e tráfego
+                - 'courier_metrics': maior/menor idade e melhor/pior condição do veículo
+    """
+    partials = {'order_metric': PartialAggregate(['Order_Date'], 'Time_taken(min)'),
+                'order_by_week': PartialAggregate(['week_of_year'], 'Time_taken(min)'),
+                'avg_std_time_graph': PartialAggregate(['City'], 'Time_taken(min)'),
+                'avg_std_time_on_traffic': PartialAggregate(['City', 'Road_traffic_density'], 'Time_taken(min)'),
+                'age': PartialAggregate([], 'Delivery_person_Age'),
+                'condition': PartialAggregate([], 'Vehicle_condition')}
+
+    for df1 in read_clean_chunks(path, chunksize):
+        df1 = _add_week_of_year(df1)
+        selected = np.ones(len(df1), dtype=bool)
+        if start is not None:
+            selected &= (df1['Order_Date'] >= start).to_numpy()
+        if end is not None:
+            selected &= (df1['Order_Date'] < end).to_numpy()
+        if traffic_options is not None:
+            selected &= df1['Road_traffic_density'].isin(traffic_options).to_numpy()
+        df1 = df1.loc[selected, :]
+        if len(df1) == 0:
+            continue
+
+        for partial in partials.values():
+            partial.update(df1)
+
+    tables = {}
+    for name in ['order_metric', 'order_by_week']:
+        df_aux = partials[name].result()['count'].astype('int64').rename('orders')
+        tables[name] = df_aux.reset_index()
+
+    for name in ['avg_std_time_graph', 'avg_std_time_on_traffic']:
+        df_aux = partials[name].result().loc[:, ['mean', 'std']]
+        df_aux.columns = ['avg_time', 'std_time']
+        tables[name] = df_aux.reset_index()
+
+    age, condition = partials['age'].result(), partials['condition'].result()
+    metrics = {'maior_idade': age['max'].max(), 'menor_idade': age['min'].min(),
+               'melhor_condicao': condition['max'].max(), 'pior_condicao': condition['min'].min()}
+    tables['courier_metrics'] = metric_values(metrics)
+
+    return tables
+
+# ========================== Execução via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m analytics.stream [dataset/train.csv] [chunksize]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'dataset/train.csv'
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    for name, table in stream_aggregates(source, size).items():
+        print('# {}\n{}\n'.format(name, table))
@@ -0,0 +1,82 @@
+# ==========================
+#         Import's
+# ==========================
+
+import math
+
+from functools import lru_cache
+
+import pandas as pd
+
+from analytics.cube import plain_keys
+from analytics.loader import load_index
+
+# ==========================
+#        Function's
+# ==========================
+
+def _select(path, start, end, traffic_options):
+    """
+        Esta função tem a responsabilidade de aplicar os filtros da sidebar pelo
+        índice em cache.
+    """
+    return load_index(path).select(start, end, list(traffic_options))
+
+@lru_cache(maxsize=32)
+def _courier_ratings(path, fingerprint, start, end, traffic_options):
+    df1 = _select(path, start, end, traffic_options)
+    df_aux = (df1.loc[:, ['Delivery_person_ID','Delivery_person_Ratings']]
+                 .groupby('Delivery_person_ID', observed=True)
+                 .mean())
+    df_aux.columns = ['Delivery mean']
+
+    return plain_keys(df_aux.reset_index())
+
+def courier_ratings(path, fingerprint, start, end, traffic_options):
+    """
+        Esta função tem a responsabilidade de calcular a avaliação média por
+        entregador. A tabela fica em cache por versão do dataset e estado dos
+        filtros; busca, ordenação e paginação acontecem sobre ela.
+    """
+    return _courier_ratings(path, fingerprint, pd.Timestamp(start), pd.Timestamp(end),
+                            tuple(sorted(traffic_options)))
+
+@lru_cache(maxsize=32)
+def _time_by_city_order(path, fingerprint, start, end, traffic_options):
+    df1 = _select(path, start, end, traffic_options)
+    cols = ['City', 'Time_taken(min)', 'Type_of_order']
+    df_aux = df1.loc[:, cols].groupby(['City','Type_of_order'], observed=True).agg({'Time_taken(min)': ['mean','std']})
+    df_aux.columns = ['avg_time','std_time']
+
+    return plain_keys(df_aux.reset_index())
+
+def time_by_city_order(path, fingerprint, start, end, traffic_options):
+    """
+        Esta função tem a responsabilidade de calcular o tempo médio e o desvio padrão
+        de entrega por cidade e tipo de pedido, em cache por estado dos filtros.
+    """
+    return _time_by_city_order(path, fingerprint, pd.Timestamp(start), pd.Timestamp(end),
+                               tuple(sorted(traffic_options)))
+
+def paginate(table, search='', search_col=None, sort_by=None, ascending=True, page=1, page_size=20):
+    """
+        Esta função tem a responsabilidade de buscar, ordenar e paginar uma tabela no
+        servidor, devolvendo apenas as linhas da página pedida.
+
+        Input: tabela, texto buscado (contido em search_col, sem diferenciar
+               maiúsculas), coluna de ordenação, página (começa em 1) e tamanho
+        Output: (linhas da página, total de linhas filtradas, total de páginas)
+    """
+    if search and search_col is not None:
+        selected = table[search_col].astype(str).str.contains(search, case=False, regex=False)
+        table = table.loc[selected.to_numpy(), :]
+
+    total = len(table)
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, int(page)), pages)
+    start = (page - 1) * page_size
+
+    if sort_by is not None:
+        table = table.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+
+    return table.iloc[start:start + page_size].reset_index(drop=True), total, pages
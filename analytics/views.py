@@ -0,0 +1,385 @@
+# ==========================
+#         Import's
+# ==========================
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+
+from analytics import aggregations
+from analytics.cube import plain_keys, time_stats, week_of_year
+from analytics.index import OrderIndex
+from analytics.kpi import kpis_from_festival_stats
+from analytics.loader import ROW_GROUP_SIZE, dataset_fingerprint, load_dataset, read_batches
+from analytics.ranking import rank_by_city
+
+# ==========================
+#        Constant's
+# ==========================
+
+# versão do formato das visões; incrementar ao mudar colunas ou medidas força a
+# reconstrução das visões antigas
+VIEWS_VERSION = 2
+
+# chaves comuns a todas as visões: uma linha por dia e tipo de tráfego (qualquer
+# uma das 16 combinações do multiselect é a soma dos tráfegos escolhidos)
+VIEW_KEYS = ['Order_Date', 'Road_traffic_density']
+
+# visão -> (dimensões além das chaves comuns, {medida: (coluna, agregação)})
+VIEWS = {
+    # cubo diário com as medidas de tempo e distância (visão empresa e restaurantes)
+    'orders': (['City', 'Festival', 'Type_of_order'],
+               {'orders': ('time', 'size'), 'time_sum': ('time', 'sum'), 'time_sumsq': ('time_sq', 'sum'),
+                'distance_sum': ('distance', 'sum'), 'distance_count': ('distance', 'count')}),
+    # avaliações por clima, idades e condição dos veículos (visão entregadores)
+    'ratings': (['Weatherconditions'],
+                {'rating_sum': ('rating', 'sum'), 'rating_count': ('rating', 'count'),
+                 'age_min': ('Delivery_person_Age', 'min'), 'age_max': ('Delivery_person_Age', 'max'),
+                 'condition_min': ('Vehicle_condition', 'min'), 'condition_max': ('Vehicle_condition', 'max')}),
+    # um entregador por dia: contagens exatas de únicos, ranking e avaliação média
+    'couriers': (['City', 'Delivery_person_ID'],
+                 {'orders': ('time', 'size'), 'time_sum': ('time', 'sum'),
+                  'rating_sum': ('rating', 'sum'), 'rating_count': ('rating', 'count')}),
+    # pedidos por coordenada de entrega: a mediana do mapa (que não se soma entre
+    # dias) é recalculada a partir dessas contagens (ver weighted_median)
+    'latitudes': (['City', 'Delivery_location_latitude'], {'orders': ('time', 'size')}),
+    'longitudes': (['City', 'Delivery_location_longitude'], {'orders': ('time', 'size')}),
+}
+
+# agregação usada para juntar visões de lotes diferentes
+MERGE = {'size': 'sum', 'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+MANIFEST = 'manifest.json'
+
+# ==========================
+#        Function's
+# ==========================
+
+def views_dir(path):
+    """
+        Esta função tem a responsabilidade de definir a pasta das visões
+        materializadas, gravada ao lado do csv de origem.
+    """
+    return os.path.splitext(path)[0] + '.views'
+
+def _finish(view):
+    """
+        Esta função tem a responsabilidade de deixar a visão no formato gravado:
+        textos como categorias (dicionário no parquet), ordenada por data e com a
+        semana do ano pré-calculada.
+    """
+    for col in view.columns:
+        if view[col].dtype == object:
+            view[col] = view[col].astype('category')
+    view = view.sort_values(VIEW_KEYS, kind='mergesort', ignore_index=True)
+    view['week_of_year'] = week_of_year(view['Order_Date'])
+
+    return view
+
+def build_view(df1, name):
+    """
+        Esta função tem a responsabilidade de pré-agregar os pedidos em uma visão:
+        uma linha por dia, tráfego e dimensões da visão, apenas com medidas que
+        podem ser somadas (ou combinadas por mínimo e máximo) entre dias e tráfegos.
+
+        Input: Dataframe limpo e nome da visão (ver VIEWS)
+        Output: Dataframe da visão, ordenado por Order_Date
+    """
+    dimensions, measures = VIEWS[name]
+    keys = VIEW_KEYS + dimensions
+    columns = sorted({col for col, _ in measures.values()} & set(df1.columns))
+
+    time = df1['Time_taken(min)'].astype('float64')
+    df_aux = df1.loc[:, keys + columns].assign(time=time, time_sq=time * time,
+                                               rating=df1['Delivery_person_Ratings'].astype('float64'))
+    view = df_aux.groupby(keys, observed=True).agg(**measures).reset_index()
+
+    return _finish(view)
+
+def merge_views(name, *views):
+    """
+        Esta função tem a responsabilidade de juntar visões construídas a partir de
+        lotes diferentes de pedidos. Como as medidas são somas, mínimos e máximos,
+        o resultado é igual à visão construída sobre todas as linhas.
+    """
+    dimensions, measures = VIEWS[name]
+    view = pd.concat(views, ignore_index=True).drop(columns='week_of_year')
+    for col in VIEW_KEYS[1:] + dimensions:
+        if not pd.api.types.is_numeric_dtype(view[col]):
+            view[col] = view[col].astype(str).astype('category')
+    view = (view.groupby(VIEW_KEYS + dimensions, observed=True)
+                .agg({measure: MERGE[agg] for measure, (_, agg) in measures.items()})
+                .reset_index())
+
+    return _finish(view)
+
+def weighted_median(view, by, value, weight='orders'):
+    """
+        Esta função tem a responsabilidade de calcular a mediana de uma coluna por
+        grupo a partir de uma visão com a quantidade de pedidos de cada valor. O
+        resultado é igual à mediana sobre os pedidos: com uma quantidade par, a
+        média dos dois valores centrais.
+
+        Input: visão recortada, colunas do grupo, coluna do valor e da quantidade
+        Output: Dataframe com as colunas do grupo e a mediana do valor
+    """
+    # uma linha por grupo e valor, em ordem crescente de valor dentro do grupo
+    df_aux = view.groupby(by + [value], observed=True)[weight].sum().reset_index()
+    after = df_aux.groupby(by, observed=True, sort=False)[weight].cumsum()
+    total = df_aux.groupby(by, observed=True, sort=False)[weight].transform('sum')
+    before = after - df_aux[weight]
+
+    middle = []
+    for position in [(total - 1) // 2, total // 2]:
+        selected = (before <= position) & (position < after)
+        middle.append(df_aux.loc[selected].set_index(by)[value])
+
+    return ((middle[0] + middle[1]) / 2).rename(value).reset_index()
+
+def _source(path):
+    """
+        Esta função tem a responsabilidade de descrever a versão do dataset (csv e
+        lotes) usada na construção das visões.
+    """
+    _, size, mtime_ns, batches = dataset_fingerprint(path)
+
+    return {'size': size, 'mtime_ns': mtime_ns, 'batches': list(batches), 'version': VIEWS_VERSION}
+
+def read_manifest(path):
+    """
+        Esta função tem a responsabilidade de ler o manifesto das visões (ou None
+        quando as visões ainda não foram construídas).
+    """
+    try:
+        with open(os.path.join(views_dir(path), MANIFEST)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def views_current(path):
+    """
+        Esta função tem a responsabilidade de verificar se as visões correspondem à
+        versão atual do dataset.
+    """
+    manifest = read_manifest(path)
+
+    return manifest is not None and manifest['source'] == _source(path)
+
+def _write(table, target):
+    """
+        Esta função tem a responsabilidade de gravar um arquivo sem que leitores
+        vejam o arquivo pela metade.
+    """
+    tmp = '{}.{}.tmp'.format(target, os.getpid())
+    if isinstance(table, pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.Table.from_pandas(table, preserve_index=False), tmp, row_group_size=ROW_GROUP_SIZE)
+    else:
+        with open(tmp, 'w') as file:
+            json.dump(table, file, indent=2)
+    os.replace(tmp, target)
+
+def read_view(path, name):
+    """
+        Esta função tem a responsabilidade de ler uma visão gravada.
+    """
+    import pyarrow.parquet as pq
+
+    return pq.read_table(os.path.join(views_dir(path), name + '.parquet'), memory_map=True).to_pandas()
+
+def build_views(path='dataset/train.csv', full=False):
+    """
+        Esta função tem a responsabilidade de construir e gravar todas as visões das
+        páginas, depois de cada carga de dados (csv novo ou lote do analytics.ingest).
+        Quando apenas lotes novos chegaram desde a última construção, só esses lotes
+        são agregados e somados às visões gravadas; caso contrário (ou com full)
+        todo o dataset é agregado.
+
+        Input: caminho do csv do dataset e se a construção deve ser completa
+        Output: manifesto gravado (versão do dataset, linhas e tempo de cada visão)
+    """
+    source = _source(path)
+    manifest = None if full else read_manifest(path)
+    if manifest is not None and manifest['source'] == source:
+        return manifest
+
+    old = manifest['source'] if manifest is not None else None
+    incremental = (old is not None and old['version'] == VIEWS_VERSION
+                   and (old['size'], old['mtime_ns']) == (source['size'], source['mtime_ns'])
+                   and source['batches'][:len(old['batches'])] == old['batches'])
+    if incremental:
+        df1 = read_batches(path, source['batches'][len(old['batches']):])
+    else:
+        df1 = load_dataset(path)
+
+    folder = views_dir(path)
+    os.makedirs(folder, exist_ok=True)
+    views = {}
+    for name in VIEWS:
+        start = time.perf_counter()
+        view = build_view(df1, name)
+        if incremental:
+            view = merge_views(name, read_view(path, name), view)
+        _write(view, os.path.join(folder, name + '.parquet'))
+        views[name] = {'rows': len(view), 'seconds': round(time.perf_counter() - start, 3)}
+
+    # o manifesto é gravado por último: marca a versão das visões já completas
+    manifest = {'source': source, 'incremental': incremental, 'rows': len(df1), 'views': views}
+    _write(manifest, os.path.join(folder, MANIFEST))
+
+    return manifest
+
+# ==========================
+#        Class
+# ==========================
+
+class MaterializedEngine:
+    """
+        Esta classe tem a responsabilidade de calcular as tabelas das páginas a
+        partir das visões materializadas (ver build_views): na execução da página
+        apenas as visões, pequenas e pré-agregadas por dia e tráfego, são lidas e
+        recortadas pelos filtros da sidebar; as linhas do dataset não são usadas.
+
+        As visões devem ser construídas pelo comando de linha (python -m
+        analytics.views) depois de cada carga; se estiverem desatualizadas, a
+        primeira execução da página as reconstrói. Entregadores únicos são
+        contados de forma exata.
+
+        Mesmos métodos e mesmas colunas do analytics.engines.PandasEngine.
+    """
+
+    name = 'materialized'
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._indexes = None
+
+    def load(self):
+        """
+            Esta função tem a responsabilidade de ler as visões da versão atual do
+            dataset e indexá-las por data e tráfego (ver analytics.index).
+        """
+        fingerprint = dataset_fingerprint(self.path)
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                if not views_current(self.path):
+                    build_views(self.path)
+                self._indexes = {name: OrderIndex(read_view(self.path, name)) for name in VIEWS}
+                self._fingerprint = fingerprint
+
+        return self._indexes
+
+    def view(self, name, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de devolver as linhas da visão no recorte.
+        """
+        return self.load()[name].select(start, end, list(traffic_options))
+
+    def _mean(self, name, by, measure, label, start, end, traffic_options):
+        """
+            Esta função tem a responsabilidade de recompor a média de uma medida
+            (soma / contagem) por grupo.
+        """
+        df_aux = (self.view(name, start, end, traffic_options)
+                      .groupby(by, observed=True)[[measure + '_sum', measure + '_count']]
+                      .sum())
+        df_aux[label] = df_aux[measure + '_sum'] / df_aux[measure + '_count']
+
+        return plain_keys(df_aux.loc[:, [label]].reset_index())
+
+    def count(self, start, end, traffic_options):
+        return int(self.view('orders', start, end, traffic_options)['orders'].sum())
+
+    def order_metric(self, start, end, traffic_options):
+        return aggregations.order_metric(self.view('orders', start, end, traffic_options))
+
+    def traffic_order_share(self, start, end, traffic_options):
+        return aggregations.traffic_order_share(self.view('orders', start, end, traffic_options))
+
+    def traffic_order_city(self, start, end, traffic_options):
+        return aggregations.traffic_order_city(self.view('orders', start, end, traffic_options))
+
+    def order_by_week(self, start, end, traffic_options):
+        return aggregations.order_by_week(self.view('orders', start, end, traffic_options))
+
+    def order_share_by_week(self, start, end, traffic_options):
+        df_couriers = (self.view('couriers', start, end, traffic_options)
+                           .groupby('week_of_year', observed=True)['Delivery_person_ID']
+                           .nunique()
+                           .reset_index())
+        return aggregations.order_share_by_week(self.view('orders', start, end, traffic_options), df_couriers)
+
+    def courier_metrics(self, start, end, traffic_options):
+        df_aux = self.view('ratings', start, end, traffic_options)
+
+        return aggregations.metric_values({'maior_idade': df_aux['age_max'].max(), 'menor_idade': df_aux['age_min'].min(),
+                                           'melhor_condicao': df_aux['condition_max'].max(),
+                                           'pior_condicao': df_aux['condition_min'].min()})
+
+    def rating_by_traffic(self, start, end, traffic_options):
+        return self._mean('ratings', 'Road_traffic_density', 'rating', 'Delivery mean', start, end, traffic_options)
+
+    def rating_by_weather(self, start, end, traffic_options):
+        return self._mean('ratings', 'Weatherconditions', 'rating', 'Weather mean', start, end, traffic_options)
+
+    def courier_ratings(self, start, end, traffic_options):
+        return self._mean('couriers', 'Delivery_person_ID', 'rating', 'Delivery mean', start, end, traffic_options)
+
+    def rank_couriers(self, start, end, traffic_options, k=10):
+        df_aux = (self.view('couriers', start, end, traffic_options)
+                      .groupby(['City', 'Delivery_person_ID'], observed=True)[['time_sum', 'orders']]
+                      .sum())
+        df_aux['Time_taken(min)'] = df_aux['time_sum'] / df_aux['orders']
+
+        return rank_by_city(df_aux.loc[:, ['Time_taken(min)']].reset_index(), k)
+
+    def restaurant_kpis(self, start, end, traffic_options):
+        orders = self.view('orders', start, end, traffic_options)
+        sums = orders.groupby('Festival', observed=True)[['distance_sum', 'distance_count']].sum()
+        df_aux = time_stats(orders, 'Festival').set_index('Festival')
+        df_aux = df_aux.assign(distance_sum=sums['distance_sum'], deliveries=sums['distance_count'])
+        couriers = self.view('couriers', start, end, traffic_options)['Delivery_person_ID'].nunique()
+
+        return kpis_from_festival_stats(df_aux, int(couriers))
+
+    def distance(self, start, end, traffic_options):
+        return self._mean('orders', 'City', 'distance', 'distance', start, end, traffic_options)
+
+    def avg_std_time_graph(self, start, end, traffic_options):
+        return time_stats(self.view('orders', start, end, traffic_options), 'City')
+
+    def avg_std_time_on_traffic(self, start, end, traffic_options):
+        return time_stats(self.view('orders', start, end, traffic_options), ['City', 'Road_traffic_density'])
+
+    def time_by_city_order(self, start, end, traffic_options):
+        return time_stats(self.view('orders', start, end, traffic_options), ['City', 'Type_of_order'])
+
+    def map_medians(self, start, end, traffic_options):
+        by = ['City', 'Road_traffic_density']
+        lat = weighted_median(self.view('latitudes', start, end, traffic_options), by, 'Delivery_location_latitude')
+        lon = weighted_median(self.view('longitudes', start, end, traffic_options), by, 'Delivery_location_longitude')
+
+        df_aux = pd.merge(lat, lon, how='inner', on=by)
+
+        return plain_keys(df_aux.loc[:, by + ['Delivery_location_latitude', 'Delivery_location_longitude']])
+
+# ========================== Construção via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m analytics.views [dataset/train.csv] [--full]
+    args = [arg for arg in sys.argv[1:] if arg != '--full']
+    dataset = args[0] if args else 'dataset/train.csv'
+    manifest = build_views(dataset, full='--full' in sys.argv)
+
+    print('Visões de {} ({} linhas{}):'.format(dataset, manifest['rows'],
+                                               ', incremental' if manifest['incremental'] else ''))
+    for name, info in manifest['views'].items():
+        print('  {}: {} linhas em {:.2f}s'.format(name, info['rows'], info['seconds']))
@@ -0,0 +1,46 @@
+# ==========================
+#         Import's
+# ==========================
+
+import pandas as pd
+import streamlit as st
+
+from analytics.tables import paginate
+
+# ==========================
+#        Function's
+# ==========================
+
+def paginated_dataframe(table, key, search_col=None, page_size=20):
+    """
+        Esta função tem a responsabilidade de mostrar uma tabela paginada no Streamlit.
+        Busca, ordenação e paginação rodam no servidor e somente as linhas da página
+        atual são enviadas ao navegador.
+
+        Input: tabela já agregada, chave única dos widgets, coluna usada na busca
+               e quantidade de linhas por página
+    """
+    col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
+    search = col1.text_input('Buscar', key=key + '_search') if search_col is not None else ''
+    sort_by = col2.selectbox('Ordenar por', list(table.columns), key=key + '_sort')
+    ascending = col3.radio('Ordem', ['Crescente', 'Decrescente'], key=key + '_order') == 'Crescente'
+    page = col4.number_input('Página', min_value=1, value=1, step=1, key=key + '_page')
+
+    df_page, total, pages = paginate(table, search, search_col, sort_by, ascending, page, page_size)
+    st.dataframe(df_page, use_container_width=True)
+    st.caption('Página {} de {} ({} linhas)'.format(min(page, pages), pages, total))
+
+def debug_panel(profiler):
+    """
+        Esta função tem a responsabilidade de fechar a medição da execução e, com a
+        medição ligada (CURRY_PROFILE=1), mostrar o painel de debug na sidebar com o
+        tempo, as linhas e a variação de memória de cada seção.
+    """
+    line = profiler.finish()
+    if line is None:
+        return
+
+    with st.sidebar.expander('Debug de desempenho'):
+        st.metric('Execução (ms)', line['total_ms'])
+        st.caption('Memória residente: {} MB'.format(line['rss_mb']))
+        st.dataframe(pd.DataFrame(line['sections']), use_container_width=True)
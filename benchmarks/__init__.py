@@ -0,0 +1,4 @@
+"""
+    Ferramentas de medição de desempenho do dashboard: gerador de train.csv
+    sintético e executor de benchmarks.
+"""
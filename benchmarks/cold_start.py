@@ -0,0 +1,83 @@
+# ==========================
+#         Import's
+# ==========================
+
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmarks.load_test import PAGES
+
+# ==========================
+#        Constant's
+# ==========================
+
+# executa apenas as linhas de import da página, em um interpretador novo
+IMPORT_SCRIPT = '''
+import ast, sys, time
+tree = ast.parse(open(sys.argv[1], encoding='utf-8').read())
+imports = ast.Module(body=[node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))], type_ignores=[])
+code = compile(imports, sys.argv[1], 'exec')
+start = time.perf_counter()
+exec(code, {'__name__': '__page__'})
+print(time.perf_counter() - start)
+'''
+
+# primeira execução da página em um interpretador novo (caches em memória vazios)
+FIRST_PAINT_SCRIPT = '''
+import sys, time, warnings
+warnings.filterwarnings('ignore')
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+start = time.perf_counter()
+at.run()
+print(time.perf_counter() - start)
+'''
+
+# ==========================
+#        Function's
+# ==========================
+
+def _measure(script, page, repeat):
+    """
+        Esta função tem a responsabilidade de rodar o script de medição em processos
+        novos e devolver a mediana dos tempos (ms).
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script, page], capture_output=True, text=True, check=True)
+        runs.append(float(output.stdout.strip().splitlines()[-1]) * 1000)
+
+    return float(np.median(runs))
+
+def cold_start(pages=PAGES, repeat=3):
+    """
+        Esta função tem a responsabilidade de medir, para cada página, o tempo dos
+        imports do script e o tempo até a primeira renderização completa em um
+        processo novo (o cache em parquet do dataset já deve existir).
+
+        Output: lista de dicionários com página, import_ms e first_paint_ms
+    """
+    return [{'page': page, 'import_ms': _measure(IMPORT_SCRIPT, page, repeat),
+             'first_paint_ms': _measure(FIRST_PAINT_SCRIPT, page, repeat)} for page in pages]
+
+# ========================== Execução via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso (na raiz do projeto): python -m benchmarks.cold_start [--repeat 3] [--output cold.json]
+    parser = argparse.ArgumentParser(description='Tempo de import e da primeira renderização das páginas.')
+    parser.add_argument('--pages', nargs='+', default=PAGES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    results = cold_start(args.pages, args.repeat)
+    for result in results:
+        print('{page:<32} import={import_ms:8.1f}ms primeira renderização={first_paint_ms:8.1f}ms'.format(**result))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
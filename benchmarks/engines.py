@@ -0,0 +1,132 @@
+# ==========================
+#         Import's
+# ==========================
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import config
+from analytics.engines import ENGINES, get_engine
+from benchmarks.run import dataset_for, environment, timeit
+
+# ==========================
+#        Constant's
+# ==========================
+
+# tabelas comparadas (métodos comuns a todos os motores)
+TABLES = ['order_metric', 'traffic_order_share', 'traffic_order_city', 'order_by_week', 'order_share_by_week',
+          'courier_metrics', 'rating_by_traffic', 'rating_by_weather', 'courier_ratings', 'rank_couriers',
+          'restaurant_kpis', 'distance', 'avg_std_time_graph', 'avg_std_time_on_traffic', 'time_by_city_order']
+
+# estados da sidebar usados nas medições
+FILTERS = [(pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7), ['Low', 'Medium', 'High', 'Jam']),
+           (pd.Timestamp(2022, 2, 20), pd.Timestamp(2022, 3, 20), ['Low', 'Jam']),
+           (pd.Timestamp(2022, 3, 1), pd.Timestamp(2022, 3, 2), ['Medium'])]
+
+# ==========================
+#        Function's
+# ==========================
+
+def _normalize(value):
+    """
+        Esta função tem a responsabilidade de deixar o resultado de um motor em uma
+        forma comparável: categorias como texto, números em 64 bits e linhas
+        ordenadas pelas chaves (cada motor pode devolver os grupos em outra ordem).
+    """
+    if isinstance(value, tuple) and not hasattr(value, '_asdict'):
+        return tuple(_normalize(item) for item in value)
+    if hasattr(value, '_asdict'):
+        value = value._asdict()
+    if isinstance(value, dict):
+        return {key: None if item is None or pd.isna(item) else float(item) for key, item in value.items()}
+
+    df_aux = value.copy()
+    keys = []
+    for col in df_aux.columns:
+        if df_aux[col].dtype == object or isinstance(df_aux[col].dtype, pd.CategoricalDtype):
+            df_aux[col] = df_aux[col].astype(str)
+            keys.append(col)
+        elif pd.api.types.is_datetime64_any_dtype(df_aux[col]):
+            keys.append(col)
+        else:
+            df_aux[col] = df_aux[col].astype('float64')
+
+    return df_aux.sort_values(keys, kind='stable').reset_index(drop=True) if keys else df_aux
+
+def same_result(left, right, rtol=1e-5):
+    """
+        Esta função tem a responsabilidade de comparar os resultados de dois motores
+        (tabelas, tuplas de tabelas ou cards).
+    """
+    left, right = _normalize(left), _normalize(right)
+    if isinstance(left, tuple):
+        return all(same_result(a, b, rtol=rtol) for a, b in zip(left, right))
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(
+            (left[key] is None and right[key] is None) or
+            (left[key] is not None and right[key] is not None and np.isclose(left[key], right[key], rtol=rtol))
+            for key in left)
+    if list(left.columns) != list(right.columns) or len(left) != len(right):
+        return False
+    try:
+        pd.testing.assert_frame_equal(left, right, check_dtype=False, rtol=rtol)
+    except AssertionError:
+        return False
+
+    return True
+
+def compare_engines(path, engines, repeat=3):
+    """
+        Esta função tem a responsabilidade de medir cada tabela em cada motor e
+        conferir se o resultado é igual ao do pandas (contagem exata de entregadores).
+
+        Output: lista de dicionários com motor, tabela, mediana em ms (somando os
+                estados da sidebar) e se o resultado bate com o pandas
+    """
+    config.DISTINCT_MODE = 'exact'
+    results = []
+    reference = get_engine(path, 'pandas')
+
+    for name in engines:
+        engine = get_engine(path, name)
+        start = time.perf_counter()
+        engine.load()
+        results.append({'engine': name, 'table': 'load', 'ms': (time.perf_counter() - start) * 1000, 'same': True})
+
+        for table in TABLES:
+            method = getattr(engine, table)
+            stats = timeit(lambda: [method(*filters) for filters in FILTERS], repeat)
+            same = all(same_result(getattr(reference, table)(*filters), method(*filters)) for filters in FILTERS)
+            results.append({'engine': name, 'table': table, 'ms': stats['median'] * 1000, 'same': same})
+
+    return results
+
+# ========================== Execução via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso (na raiz do projeto): python -m benchmarks.engines --sizes 1000000 --engines pandas duckdb polars
+    parser = argparse.ArgumentParser(description='Compara os motores das agregações das páginas.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': environment(), 'results': {}}
+    for size in args.sizes:
+        results = compare_engines(dataset_for(size), args.engines, args.repeat)
+        report['results'][str(size)] = results
+
+        df_aux = pd.DataFrame(results).pivot(index='table', columns='engine', values='ms').loc[['load'] + TABLES, args.engines]
+        print('# {} linhas (ms, soma de {} estados da sidebar)'.format(size, len(FILTERS)))
+        print(df_aux.round(1).to_string())
+        different = [(r['engine'], r['table']) for r in results if not r['same']]
+        print('resultados diferentes do pandas: {}\n'.format(different or 'nenhum'))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
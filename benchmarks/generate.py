@@ -0,0 +1,150 @@
+# ==========================
+#         Import's
+# ==========================
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# ==========================
+#        Constant's
+# ==========================
+
+COLUMNS = ['ID', 'Delivery_person_ID', 'Delivery_person_Age', 'Delivery_person_Ratings',
+           'Restaurant_latitude', 'Restaurant_longitude', 'Delivery_location_latitude',
+           'Delivery_location_longitude', 'Order_Date', 'Time_Orderd', 'Time_Order_picked',
+           'Weatherconditions', 'Road_traffic_density', 'Vehicle_condition', 'Type_of_order',
+           'Type_of_vehicle', 'multiple_deliveries', 'Festival', 'City', 'Time_taken(min)']
+
+# cidades do dataset original (prefixo do ID do entregador e coordenadas aproximadas)
+CITY_CENTERS = {'INDO': (22.72, 75.86), 'BANG': (12.97, 77.59), 'COIMB': (11.02, 76.96),
+                'CHEN': (13.08, 80.27), 'HYD': (17.39, 78.49), 'RANCHI': (23.34, 85.31),
+                'MYS': (12.30, 76.64), 'DEH': (30.32, 78.03), 'KOC': (9.93, 76.27),
+                'PUNE': (18.52, 73.86), 'LUDH': (30.90, 75.86), 'KNP': (26.45, 80.33),
+                'MUM': (19.08, 72.88), 'KOL': (22.57, 88.36), 'JAP': (26.91, 75.79),
+                'SUR': (21.17, 72.83), 'GOA': (15.50, 73.83), 'AURG': (19.88, 75.34),
+                'AGR': (27.18, 78.01), 'VAD': (22.31, 73.18), 'ALH': (25.44, 81.85),
+                'BHP': (23.26, 77.41)}
+
+# valores com o espaço sobrando no final, como no csv original
+TRAFFIC = np.array(['Low ', 'Medium ', 'High ', 'Jam '])
+CITY = np.array(['Metropolitian ', 'Urban ', 'Semi-Urban '])
+ORDER = np.array(['Snack ', 'Meal ', 'Drinks ', 'Buffet '])
+VEHICLE = np.array(['motorcycle ', 'scooter ', 'electric_scooter ', 'bicycle '])
+WEATHER = np.array(['conditions Sunny', 'conditions Stormy', 'conditions Sandstorms',
+                    'conditions Cloudy', 'conditions Fog', 'conditions Windy'])
+FESTIVAL = np.array(['No ', 'Yes '])
+
+# fração de linhas com 'NaN ' em cada coluna
+NAN_RATES = {'Delivery_person_Age': 0.04, 'Road_traffic_density': 0.013, 'City': 0.026,
+             'Festival': 0.005, 'multiple_deliveries': 0.022, 'Time_Orderd': 0.018}
+
+# ==========================
+#        Function's
+# ==========================
+
+def _nan(rng, values, rate):
+    """
+        Esta função tem a responsabilidade de trocar uma fração dos valores por 'NaN '.
+    """
+    values = values.astype(object)
+    values[rng.random(len(values)) < rate] = 'NaN '
+
+    return values
+
+def generate_chunk(rows, first_id=0, seed=0):
+    """
+        Esta função tem a responsabilidade de gerar pedidos brutos no formato do
+        train.csv, com as mesmas sujeiras que o clean_code trata: 'NaN ' em texto,
+        espaços no final dos valores e o prefixo '(min) ' no tempo de entrega.
+    """
+    rng = np.random.default_rng(seed)
+    prefixes = np.array(list(CITY_CENTERS))
+    centers = np.array(list(CITY_CENTERS.values()))
+
+    city_code = rng.integers(0, len(prefixes), rows)
+    courier = (pd.Series(prefixes[city_code]) + 'RES' + pd.Series(rng.integers(1, 21, rows)).map('{:02d}'.format)
+               + 'DEL' + pd.Series(rng.integers(1, 4, rows)).map('{:02d}'.format) + ' ')
+
+    restaurant = centers[city_code] + rng.normal(0, 0.05, (rows, 2))
+    delivery = restaurant + rng.uniform(-0.15, 0.15, (rows, 2))
+    # como no original, alguns restaurantes têm latitude/longitude negativas ou zeradas
+    flipped = rng.random(rows) < 0.02
+    restaurant[flipped] *= -1
+    restaurant[rng.random(rows) < 0.008] = 0
+
+    age = _nan(rng, rng.integers(15, 40, rows).astype(str), NAN_RATES['Delivery_person_Age'])
+    ratings = np.round(rng.uniform(2.5, 5.0, rows), 1).astype(str).astype(object)
+    ratings[age == 'NaN '] = 'NaN '
+
+    dates = pd.Timestamp(2022, 2, 11) + pd.to_timedelta(rng.integers(0, 55, rows), unit='D')
+    ordered = pd.Series(rng.integers(8 * 60, 23 * 60, rows))
+    ordered_text = ((ordered // 60).map('{:02d}'.format) + ':' + (ordered % 60).map('{:02d}'.format) + ':00').to_numpy()
+    picked = ordered + rng.choice([5, 10, 15], rows)
+    picked_text = ((picked // 60 % 24).map('{:02d}'.format) + ':' + (picked % 60).map('{:02d}'.format) + ':00').to_numpy()
+
+    weather = WEATHER[rng.integers(0, len(WEATHER), rows)].astype(object)
+    weather[rng.random(rows) < 0.013] = 'conditions NaN'
+
+    traffic = rng.integers(0, len(TRAFFIC), rows)
+    festival = (rng.random(rows) < 0.02).astype(int)
+    time_taken = np.clip(rng.normal(26, 8, rows) + 3 * traffic + 10 * festival, 10, 54).astype(int)
+
+    df = pd.DataFrame({
+        'ID': ('0x' + pd.Series(np.arange(first_id, first_id + rows)).map('{:x}'.format) + ' ').to_numpy(),
+        'Delivery_person_ID': courier.to_numpy(),
+        'Delivery_person_Age': age,
+        'Delivery_person_Ratings': ratings,
+        'Restaurant_latitude': np.round(restaurant[:, 0], 6),
+        'Restaurant_longitude': np.round(restaurant[:, 1], 6),
+        'Delivery_location_latitude': np.round(np.abs(delivery[:, 0]), 6),
+        'Delivery_location_longitude': np.round(np.abs(delivery[:, 1]), 6),
+        'Order_Date': dates.strftime('%d-%m-%Y'),
+        'Time_Orderd': _nan(rng, ordered_text, NAN_RATES['Time_Orderd']),
+        'Time_Order_picked': picked_text,
+        'Weatherconditions': weather,
+        'Road_traffic_density': _nan(rng, TRAFFIC[traffic], NAN_RATES['Road_traffic_density']),
+        'Vehicle_condition': rng.integers(0, 4, rows),
+        'Type_of_order': ORDER[rng.integers(0, len(ORDER), rows)],
+        'Type_of_vehicle': VEHICLE[rng.integers(0, len(VEHICLE), rows)],
+        'multiple_deliveries': _nan(rng, rng.integers(0, 4, rows).astype(str), NAN_RATES['multiple_deliveries']),
+        'Festival': _nan(rng, FESTIVAL[festival], NAN_RATES['Festival']),
+        'City': _nan(rng, CITY[rng.integers(0, len(CITY), rows)], NAN_RATES['City']),
+        'Time_taken(min)': np.char.add('(min) ', time_taken.astype(str)),
+    })
+
+    return df.loc[:, COLUMNS]
+
+def generate_train_csv(rows, path, seed=0, chunksize=1000000):
+    """
+        Esta função tem a responsabilidade de gravar um train.csv sintético com a
+        quantidade de linhas pedida, em blocos para não ocupar muita memória.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    written = 0
+    with open(path, 'w', newline='') as file:
+        while written < rows:
+            size = min(chunksize, rows - written)
+            df = generate_chunk(size, first_id=written, seed=seed + written)
+            df.to_csv(file, index=False, header=(written == 0))
+            written += size
+
+    return path
+
+# ========================== Geração via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m benchmarks.generate 1000000 benchmarks/data/train_1000000.csv
+    parser = argparse.ArgumentParser(description='Gera um train.csv sintético.')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_train_csv(args.rows, args.path, args.seed)
+    print('{} linhas gravadas em {}'.format(args.rows, args.path))
@@ -0,0 +1,277 @@
+# ==========================
+#         Import's
+# ==========================
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+# ==========================
+#        Constant's
+# ==========================
+
+PAGES = ['Home.py', 'pages/1_visao_empresa.py', 'pages/2_visao_entregadores.py', 'pages/3_visao_restaurantes.py']
+
+TRAFFIC = ['Low', 'Medium', 'High', 'Jam']
+FIRST_DAY = datetime.datetime(2022, 2, 11)
+DAYS = 54
+
+# porta do servidor do teste e tempo máximo para ele subir (segundos)
+PORT = 8599
+STARTUP_TIMEOUT = 60
+
+# ==========================
+#        Function's
+# ==========================
+
+def random_filters(rng):
+    """
+        Esta função tem a responsabilidade de sortear um estado da sidebar: um
+        intervalo de datas dentro do slider e um subconjunto dos tipos de tráfego.
+    """
+    first, last = sorted(rng.randint(0, DAYS) for _ in range(2))
+    dates = (FIRST_DAY + datetime.timedelta(days=first), FIRST_DAY + datetime.timedelta(days=last))
+    traffic = rng.sample(TRAFFIC, rng.randint(1, len(TRAFFIC)))
+
+    return dates, traffic
+
+def _micros(value):
+    """
+        Esta função tem a responsabilidade de converter uma data no valor do slider
+        de datas do streamlit (microssegundos desde 1970, sem fuso).
+    """
+    return (value - datetime.datetime(1970, 1, 1)) / datetime.timedelta(microseconds=1)
+
+def _page_name(page):
+    """
+        Esta função tem a responsabilidade de obter o nome da página no streamlit
+        ('pages/1_visao_empresa.py' -> 'visao_empresa').
+    """
+    return re.sub(r'^\d+_', '', os.path.splitext(os.path.basename(page))[0])
+
+def start_server(port=PORT, timeout=STARTUP_TIMEOUT):
+    """
+        Esta função tem a responsabilidade de subir um servidor 'streamlit run' na
+        raiz do projeto (com as mesmas variáveis de ambiente, como CURRY_ENGINE) e
+        esperar o health check responder.
+
+        Output: processo do servidor
+    """
+    server = subprocess.Popen([sys.executable, '-m', 'streamlit', 'run', PAGES[0], '--server.headless', 'true',
+                               '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            urllib.request.urlopen('http://localhost:{}/_stcore/health'.format(port), timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError('o servidor do streamlit não respondeu em {}s'.format(timeout))
+
+def server_rss_mb(pid):
+    """
+        Esta função tem a responsabilidade de ler a memória residente atual e o pico
+        (VmRSS e VmHWM, Linux) do processo do servidor.
+
+        Output: (atual, pico) em MB
+    """
+    with open('/proc/{}/status'.format(pid)) as file:
+        values = dict(line.split(':', 1) for line in file)
+
+    return tuple(int(values[key].split()[0]) / 1024 for key in ('VmRSS', 'VmHWM'))
+
+# ==========================
+#        Class
+# ==========================
+
+class Session:
+    """
+        Esta classe tem a responsabilidade de simular o navegador de um usuário: uma
+        conexão websocket com o servidor que pede execuções da página (como o
+        rerun do navegador) e espera o fim de cada uma.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.pages = {}
+        self.widgets = {}
+
+    @classmethod
+    async def connect(cls, port=PORT):
+        """
+            Esta função tem a responsabilidade de abrir a conexão com o servidor.
+        """
+        from tornado.websocket import websocket_connect
+
+        url = 'ws://localhost:{}/_stcore/stream'.format(port)
+        return cls(await websocket_connect(url, max_message_size=1 << 30))
+
+    async def run(self, page, states=()):
+        """
+            Esta função tem a responsabilidade de executar a página com os valores
+            de widgets informados e esperar o fim da execução.
+
+            Output: (segundos, execução com erro)
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.page_script_hash = self.pages.get(_page_name(page), '')
+        message.rerun_script.widget_states.widgets.extend(states)
+
+        start = time.perf_counter()
+        await self.connection.write_message(message.SerializeToString(), binary=True)
+        error = False
+        while True:
+            data = await self.connection.read_message()
+            if data is None:
+                # conexão fechada pelo servidor
+                return time.perf_counter() - start, True
+
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            if kind == 'new_session':
+                self.pages = {item.page_name: item.page_script_hash for item in forward.new_session.app_pages}
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                widget = element.WhichOneof('type')
+                error = error or widget == 'exception'
+                if widget in ('slider', 'multiselect'):
+                    self.widgets[widget] = getattr(element, widget)
+            elif kind == 'script_finished':
+                return time.perf_counter() - start, error or forward.script_finished != 0
+
+    def filters(self, rng):
+        """
+            Esta função tem a responsabilidade de montar os valores do slider de
+            datas e do multiselect de tráfego de um estado sorteado da sidebar.
+            Páginas sem filtros são reexecutadas sem valores.
+        """
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        if 'slider' not in self.widgets:
+            return []
+
+        dates, traffic = random_filters(rng)
+        slider = WidgetState(id=self.widgets['slider'].id)
+        slider.double_array_value.data.extend(_micros(value) for value in dates)
+        multiselect = WidgetState(id=self.widgets['multiselect'].id)
+        options = list(self.widgets['multiselect'].options)
+        multiselect.int_array_value.data.extend(options.index(value) for value in traffic)
+
+        return [slider, multiselect]
+
+    def close(self):
+        self.connection.close()
+
+# ==========================
+#        Function's
+# ==========================
+
+async def run_session(page, reruns, seed, port=PORT):
+    """
+        Esta função tem a responsabilidade de simular a sessão de um usuário: abre
+        a página e faz reruns movendo o slider de datas e o multiselect de tráfego
+        (quando a página tem sidebar de filtros).
+
+        Output: dicionário com a latência da primeira execução, as latências dos
+                reruns (segundos) e a quantidade de execuções com erro
+    """
+    rng = random.Random(seed)
+    session = await Session.connect(port)
+    try:
+        # a primeira execução (página inicial) traz a lista de páginas do app
+        await session.run(PAGES[0])
+        first, error = await session.run(page)
+        errors = int(error)
+
+        latencies = []
+        for _ in range(reruns):
+            seconds, error = await session.run(page, session.filters(rng))
+            latencies.append(seconds)
+            errors += int(error)
+    finally:
+        session.close()
+
+    return {'first': first, 'latencies': latencies, 'errors': errors}
+
+def load_test(page, sessions, reruns, seed=0, server=None, port=PORT):
+    """
+        Esta função tem a responsabilidade de rodar sessões simultâneas da página
+        contra um único servidor 'streamlit run' e resumir as latências. Todas as
+        sessões rodam no mesmo processo, como em produção: o cache do processo
+        (analytics.loader), o lock das construções e o GIL são compartilhados, e a
+        memória medida é a desse processo. Os clientes são conexões websocket em
+        um único event loop, que só espera as respostas do servidor.
+
+        Input: página, sessões, reruns por sessão, semente dos filtros e o
+               processo do servidor (ver start_server)
+        Output: dicionário com percentis p50/p95/p99 dos reruns (ms), vazão
+                (reruns por segundo), primeira execução, erros e memória
+                residente do servidor (atual e pico)
+    """
+    async def run_all():
+        return await asyncio.gather(*[run_session(page, reruns, seed + number, port) for number in range(sessions)])
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([value for result in results for value in result['latencies']]) * 1000
+    first = np.array([result['first'] for result in results]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    rss, peak = server_rss_mb(server.pid) if server is not None else (np.nan, np.nan)
+
+    return {'page': page, 'sessions': sessions, 'reruns': int(len(latencies)),
+            'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99),
+            'first_run_max_ms': float(first.max()), 'throughput_rps': len(latencies) / elapsed,
+            'errors': sum(result['errors'] for result in results),
+            'server_rss_mb': rss, 'server_peak_rss_mb': peak}
+
+# ========================== Execução via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso (na raiz do projeto): python -m benchmarks.load_test --sessions 1 4 16 --reruns 20
+    # sobe um 'streamlit run' na porta --port; as sessões são conexões websocket com ele
+    parser = argparse.ArgumentParser(description='Teste de carga das páginas do dashboard.')
+    parser.add_argument('--pages', nargs='+', default=PAGES)
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--reruns', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': []}
+    server = start_server(args.port)
+    try:
+        for sessions in args.sessions:
+            for page in args.pages:
+                result = load_test(page, sessions, args.reruns, args.seed, server, args.port)
+                report['results'].append(result)
+                print('{page:<32} sessões={sessions:<3} p50={p50_ms:8.1f}ms p95={p95_ms:8.1f}ms '
+                      'p99={p99_ms:8.1f}ms vazão={throughput_rps:6.2f}/s erros={errors} '
+                      'rss do servidor={server_rss_mb:.0f}MB (pico {server_peak_rss_mb:.0f}MB)'.format(**result))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+        print('Resultados gravados em {}'.format(args.output))
@@ -0,0 +1,180 @@
+# ==========================
+#         Import's
+# ==========================
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics import aggregations
+from analytics.cleaning import clean_code, compact_schema
+from analytics.cube import build_cube
+from analytics.geo import add_distance
+from analytics.index import OrderIndex
+from analytics.maps import map_points
+from analytics.ranking import rank_couriers
+from analytics.sketch import CourierSketches, couriers_by_week
+from benchmarks.generate import generate_train_csv
+
+# ==========================
+#        Constant's
+# ==========================
+
+DEFAULT_SIZES = [100000, 1000000, 10000000]
+DATA_DIR = os.path.join('benchmarks', 'data')
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+# ==========================
+#        Function's
+# ==========================
+
+def timeit(func, repeat=3):
+    """
+        Esta função tem a responsabilidade de executar func algumas vezes e medir
+        cada execução.
+
+        Output: dicionário com o melhor tempo, a mediana e todas as medições (segundos)
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+
+    return {'min': min(runs), 'median': float(np.median(runs)), 'runs': runs}
+
+def dataset_for(rows, seed=0):
+    """
+        Esta função tem a responsabilidade de devolver o csv sintético com a
+        quantidade de linhas pedida, gerando o arquivo apenas na primeira vez.
+    """
+    path = os.path.join(DATA_DIR, 'train_{}.csv'.format(rows))
+    if not os.path.exists(path):
+        generate_train_csv(rows, path, seed)
+
+    return path
+
+def company_cases(df1, cube, sketches):
+    """
+        Esta função tem a responsabilidade de montar as agregações da visão empresa,
+        na mesma forma em que a página as calcula.
+    """
+    def order_share_by_week_exact():
+        return aggregations.order_share_by_week(cube, couriers_by_week(df1))
+
+    return {'order_metric': lambda: aggregations.order_metric(cube),
+            'traffic_order_share': lambda: aggregations.traffic_order_share(cube),
+            'traffic_order_city': lambda: aggregations.traffic_order_city(cube),
+            'order_by_week': lambda: aggregations.order_by_week(cube),
+            'order_share_by_week': lambda: aggregations.order_share_by_week(cube, sketches.unique_by_week()),
+            'order_share_by_week_exact': order_share_by_week_exact,
+            'country_maps': lambda: map_points(aggregations.map_medians(df1), 'medians')}
+
+def run_size(rows, repeat=3, seed=0):
+    """
+        Esta função tem a responsabilidade de medir todas as etapas para um tamanho
+        de dataset: leitura, limpeza, distância, filtros, rankings e as agregações
+        das páginas.
+
+        Output: dicionário {etapa: medições}
+    """
+    path = dataset_for(rows, seed)
+    results = {}
+
+    results['read_csv'] = timeit(lambda: pd.read_csv(path), repeat)
+    df = pd.read_csv(path)
+
+    results['clean_code'] = timeit(lambda: clean_code(df), repeat)
+    df1 = clean_code(df)
+    del df
+
+    results['distance'] = timeit(lambda: add_distance(df1.copy(deep=False)), repeat)
+    df1 = compact_schema(add_distance(df1))
+    df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+
+    results['order_index'] = timeit(lambda: OrderIndex(df1), repeat)
+    order_index = OrderIndex(df1)
+    results['filter'] = timeit(lambda: order_index.select(pd.Timestamp(2022, 2, 20), pd.Timestamp(2022, 3, 20), ['Low', 'Jam']), repeat)
+
+    results['top_delivers'] = timeit(lambda: rank_couriers(df1), repeat)
+    results['avg_std_time_graph'] = timeit(lambda: aggregations.avg_std_time_graph(df1), repeat)
+    results['avg_std_time_on_traffic'] = timeit(lambda: aggregations.avg_std_time_on_traffic(df1), repeat)
+    results['distance_by_city'] = timeit(lambda: aggregations.distance(df1), repeat)
+
+    results['build_cube'] = timeit(lambda: build_cube(df1), repeat)
+    results['build_sketches'] = timeit(lambda: CourierSketches.build(df1), repeat)
+    cube, sketches = build_cube(df1), CourierSketches.build(df1)
+
+    for name, func in company_cases(df1, cube, sketches).items():
+        results['company.' + name] = timeit(func, repeat)
+
+    return results
+
+def compare(current, baseline, tolerance=0.2):
+    """
+        Esta função tem a responsabilidade de comparar duas execuções pela mediana
+        de cada etapa.
+
+        Output: Dataframe com as medianas, a razão atual/base e se houve regressão
+                (razão acima de 1 + tolerance)
+    """
+    rows = []
+    for size, cases in current['results'].items():
+        for name, stats in cases.items():
+            base = baseline['results'].get(size, {}).get(name)
+            if base is None:
+                continue
+            ratio = stats['median'] / base['median'] if base['median'] > 0 else float('nan')
+            rows.append({'rows': int(size), 'case': name, 'baseline': base['median'],
+                         'current': stats['median'], 'ratio': ratio, 'regression': ratio > 1 + tolerance})
+
+    return pd.DataFrame(rows, columns=['rows', 'case', 'baseline', 'current', 'ratio', 'regression'])
+
+def environment():
+    """
+        Esta função tem a responsabilidade de registrar a máquina e as versões usadas
+        na execução, para que resultados de ambientes diferentes não sejam confundidos.
+    """
+    return {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+            'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+
+# ========================== Execução via linha de comando ==========================
+
+if __name__ == '__main__':
+    # uso: python -m benchmarks.run [--sizes 100000 1000000] [--compare base.json]
+    parser = argparse.ArgumentParser(description='Mede o desempenho das etapas do dashboard.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--compare', default=None, help='json de uma execução anterior')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': environment(),
+              'repeat': args.repeat, 'results': {}}
+    for size in args.sizes:
+        report['results'][str(size)] = run_size(size, args.repeat, args.seed)
+        for name, stats in report['results'][str(size)].items():
+            print('{:>10} {:<36} {:>10.4f}s'.format(size, name, stats['median']))
+
+    output = args.output or os.path.join(RESULTS_DIR, 'bench-{}.json'.format(time.strftime('%Y%m%d-%H%M%S')))
+    folder = os.path.dirname(output)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print('Resultados gravados em {}'.format(output))
+
+    if args.compare:
+        with open(args.compare) as file:
+            df_aux = compare(report, json.load(file), args.tolerance)
+        print(df_aux.to_string(index=False))
+        if df_aux['regression'].any():
+            sys.exit(1)
@@ -3,96 +3,21 @@
 # ==========================
 
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
-import folium
 
-from streamlit_folium import folium_static
-from haversine import haversine
-from PIL import Image
+from analytics.engines import get_engine
+from analytics.profiling import PageProfiler
+from analytics.widgets import debug_panel, paginated_dataframe
 
 st.set_page_config(page_title='Visão entregadores', page_icon='🚚', layout='wide')
-
-# ==========================
-#        Function's
-# ==========================
-
-def clean_code(df1):
-    """ Esta função tem a responsabilidade de limpar o dataframe
-        Tipos de limpeza:
-        1. Remoção dos dados NaN
-        2. Mudança do tipo da coluna de dados
-        3. Remoção dos espaços das variáveis de texto
-        4. Formatação da coluna de datas
-        5. Limpeza da coluna de tempo (remoção do texto da variável numérica)
-        
-        Input: Dataframe
-        Output: Dataframe
-    """
-    # removendo NaN
-    selected = (df1['Delivery_person_Age'] != 'NaN ')
-    df1 = df1.loc[selected, :]
-    selected = (df1['Road_traffic_density'] != 'NaN ')
-    df1 = df1.loc[selected, :]
-    selected = (df1['City'] != 'NaN ')
-    df1 = df1.loc[selected, :]
-    selected = (df1['Festival'] != 'NaN ')
-    df1 = df1.loc[selected, :]
-
-    # conversão string para inteiro
-    df1['Delivery_person_Age'] = df1['Delivery_person_Age'].astype(int)
-
-    # conversão string para float
-    df1['Delivery_person_Ratings'] = df1['Delivery_person_Ratings'].astype(float)
-
-    # conversão string para data
-    df1['Order_Date'] = pd.to_datetime(df1['Order_Date'], format='%d-%m-%Y')
-
-    # conversão string para inteiro
-    selected = (df1['multiple_deliveries'] != 'NaN ')
-    df1 = df1.loc[selected, :]
-    df1['multiple_deliveries'] = df1['multiple_deliveries'].astype(int)
-
-    # removendo os espaços da coluna ID
-    df1.loc[:, 'ID'] = df1.loc[:, 'ID'].str.strip()
-    df1.loc[:, 'Weatherconditions'] = df1.loc[:, 'Weatherconditions'].str.strip()
-    df1.loc[:, 'Road_traffic_density'] = df1.loc[:, 'Road_traffic_density'].str.strip()
-    df1.loc[:, 'Type_of_order'] = df1.loc[:, 'Type_of_order'].str.strip()
-    df1.loc[:, 'Type_of_vehicle'] = df1.loc[:, 'Type_of_vehicle'].str.strip()
-    df1.loc[:, 'City'] = df1.loc[:, 'City'].str.strip()
-    df1.loc[:, 'Festival'] = df1.loc[:, 'Festival'].str.strip()
-
-    # limpando a coluna time taken
-    df1['Time_taken(min)'] = df1['Time_taken(min)'].apply(lambda x: x.split('(min) ')[1])
-    df1['Time_taken(min)'] = df1['Time_taken(min)'].astype(int)
-    
-    return df1
-
-def top_delivers(df1, top_asc):
-    """
-        Esta função tem a responsabilidade de mostrar os top 10 entregadores
-        mais rápidos e lentos.
-    """
-    df2 = (df1.loc[:, ['Delivery_person_ID', 'City', 'Time_taken(min)']]
-              .groupby(['City', 'Delivery_person_ID'])
-              .mean()
-              .sort_values(['City', 'Time_taken(min)'], ascending=top_asc)
-              .reset_index())  
-    df_aux01 = df2.loc[df2['City'] == 'Metropolitian', :].head(10)
-    df_aux02 = df2.loc[df2['City'] == 'Urban', :].head(10)
-    df_aux03 = df2.loc[df2['City'] == 'Semi-Urban', :].head(10)
-    df3 = pd.concat([df_aux01, df_aux02, df_aux03]).reset_index(drop=True)
-                
-    return df3
+profiler = PageProfiler('visao_entregadores')
 
 # ========================== Inicio da estrutura lógica do código ==========================
 
-# Import dataset
-df = pd.read_csv('dataset/train.csv')
-
-# Limpando os dados
-df1 = clean_code(df)
+# Import dataset (motor das agregações e dados em cache compartilhado)
+with profiler.section('load'):
+    engine = get_engine('dataset/train.csv')
+    engine.load()
 
 # ==========================
 #          Sidebar
@@ -100,20 +25,20 @@ df1 = clean_code(df)
 
 st.header('Marketplace - Visão entregadores')
 
-image = Image.open('logo.jpg')
-st.sidebar.image(image, width=120)
+st.sidebar.image('logo.jpg', width=120)
 
 st.sidebar.markdown('# Curry company')
 st.sidebar.markdown('## Fastest delivery in Town.')
 st.sidebar.markdown("""---""")
-st.sidebar.markdown('## Selecione uma data limite')
+st.sidebar.markdown('## Selecione um intervalo de datas')
 
 date_slider = st.sidebar.slider(
-    'Até qual valor?',
-    value=pd.datetime(2022, 4, 13),
+    'Qual intervalo?',
+    value=(pd.datetime(2022, 2, 11), pd.datetime(2022, 4, 6)),
     min_value=pd.datetime(2022, 2, 11),
     max_value=pd.datetime(2022, 4, 6),
     format='DD-MM-YYYY')
+start_date, end_date = date_slider
 st.sidebar.markdown("""---""")
 
 st.sidebar.markdown('## Quais as condições climáticas')
@@ -125,13 +50,15 @@ st.sidebar.markdown("""---""")
 
 st.sidebar.markdown('### Powered by Comunidade DS')
 
-# Filtro de data
-selected01 = df1['Order_Date'] < date_slider
-df1 = df1.loc[selected01, :]
+# Filtros de data (intervalo fechado) e de trânsito, aplicados pelo motor
+end_limit = end_date + pd.Timedelta(days=1)
+filters = (start_date, end_limit, traffic_options)
 
-# Filtro de trânsito
-selected02 = df1['Road_traffic_density'].isin(traffic_options)
-df1 = df1.loc[selected02, :]
+# Com a medição ligada, o recorte é contado à parte (tempo da etapa de filtro)
+orders = None
+if profiler.enabled:
+    with profiler.section('filter') as section:
+        orders = section.rows = engine.count(*filters)
 
 # ==========================
 #          Layout 
@@ -146,21 +73,19 @@ with tab1:
         st.title('Overall metrics')
         
         col1, col2, col3, col4 = st.columns(4, gap='large')
+        with profiler.section('courier_metrics', rows=orders):
+            metrics = engine.courier_metrics(*filters)
         with col1:
-            maior_idade = df1.loc[:, 'Delivery_person_Age'].max()
-            col1.metric('Maior idade', maior_idade)
+            col1.metric('Maior idade', metrics['maior_idade'])
             
         with col2:
-            menor_idade = df1.loc[:, 'Delivery_person_Age'].min()
-            col2.metric('Menor idade', menor_idade)
+            col2.metric('Menor idade', metrics['menor_idade'])
             
         with col3:
-            melhor_condicao = df1.loc[:, 'Vehicle_condition'].max()
-            col3.metric('Melhor condição', melhor_condicao)
+            col3.metric('Melhor condição', metrics['melhor_condicao'])
             
         with col4:
-            pior_condicao = df1.loc[:, 'Vehicle_condition'].min()
-            col4.metric('Pior condição', pior_condicao)
+            col4.metric('Pior condição', metrics['pior_condicao'])
     
     # container colunas
     with st.container():
@@ -170,27 +95,21 @@ with tab1:
         
         with col1:
             st.markdown('##### Avaliação média por entregador')
-            delivery_avg_rating_deliver = (df1.loc[:, ['Delivery_person_ID','Delivery_person_Ratings']]
-                                             .groupby('Delivery_person_ID')
-                                             .mean())
-            delivery_avg_rating_deliver.columns = ['Delivery mean']
-            delivery_avg_rating_deliver = delivery_avg_rating_deliver.reset_index()
-            st.dataframe(delivery_avg_rating_deliver)
+            with profiler.section('courier_ratings') as section:
+                delivery_avg_rating_deliver = engine.courier_ratings(*filters)
+                section.rows = len(delivery_avg_rating_deliver)
+            paginated_dataframe(delivery_avg_rating_deliver, key='ratings', search_col='Delivery_person_ID')
             
         with col2:
             st.markdown('##### Avaliação média por trânsito')
-            df_avg_std_rating_by_traffic = (df1.loc[: ,['Delivery_person_Ratings','Road_traffic_density']]
-                                               .groupby('Road_traffic_density')
-                                               .agg({'Delivery_person_Ratings': ['mean']}))
-            df_avg_std_rating_by_traffic.columns = ['Delivery mean']
-            df_avg_std_rating_by_traffic = df_avg_std_rating_by_traffic.reset_index()
+            with profiler.section('rating_by_traffic') as section:
+                df_avg_std_rating_by_traffic = engine.rating_by_traffic(*filters)
+                section.rows = len(df_avg_std_rating_by_traffic)
             st.dataframe(df_avg_std_rating_by_traffic)
             st.markdown('##### Avaliação média por clima')
-            df_avg_std_rating_by_weather = (df1.loc[: ,['Delivery_person_Ratings','Weatherconditions']]
-                                               .groupby('Weatherconditions')
-                                               .agg({'Delivery_person_Ratings': ['mean']}))
-            df_avg_std_rating_by_weather.columns = ['Weather mean']
-            df_avg_std_rating_by_weather = df_avg_std_rating_by_weather.reset_index()
+            with profiler.section('rating_by_weather') as section:
+                df_avg_std_rating_by_weather = engine.rating_by_weather(*filters)
+                section.rows = len(df_avg_std_rating_by_weather)
             st.dataframe(df_avg_std_rating_by_weather)
     
     # container colunas
@@ -198,13 +117,16 @@ with tab1:
         st.markdown("""---""")
         st.title('Velocidade de entrega')
         col1, col2 = st.columns(2)
+        with profiler.section('rank_couriers') as section:
+            df_fastest, df_slowest = engine.rank_couriers(*filters, k=10)
+            section.rows = len(df_fastest) + len(df_slowest)
         
         with col1:
             st.markdown('##### Top entregadores mais rápidos')
-            df3 = top_delivers(df1, top_asc=True)
-            st.dataframe(df3)
+            st.dataframe(df_fastest)
 
         with col2:
             st.markdown('##### Top entregadores mais lentos')
-            df3 = top_delivers(df1, top_asc=False)
-            st.dataframe(df3)
\ No newline at end of file
+            st.dataframe(df_slowest)
+
+debug_panel(profiler)
@@ -0,0 +1,50 @@
+# ==========================
+#         Import's
+# ==========================
+
+import pandas as pd
+import pytest
+
+from analytics import figures
+from analytics.engines import get_engine
+from benchmarks.generate import generate_chunk
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture(scope='module')
+def semi_urban_jam_only(tmp_path_factory):
+    """
+        Csv em que os pedidos Semi-Urban só existem com trânsito Jam, como no
+        export real: filtrar apenas 'Low' remove a cidade inteira do recorte.
+    """
+    df = generate_chunk(3000, seed=11)
+    df.loc[df['City'].str.strip() == 'Semi-Urban', 'Road_traffic_density'] = 'Jam '
+    path = tmp_path_factory.mktemp('dataset') / 'train.csv'
+    df.to_csv(path, index=False)
+
+    return str(path)
+
+# ==========================
+#        Tests
+# ==========================
+
+@pytest.mark.parametrize('name', ['pandas', 'materialized'])
+@pytest.mark.parametrize('traffic_options', [['Low'], []])
+def test_tables_without_a_city_render(semi_urban_jam_only, name, traffic_options):
+    engine = get_engine(semi_urban_jam_only, name)
+    engine.load()
+    filters = (pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7), traffic_options)
+
+    tables = {'traffic_order_city': engine.traffic_order_city(*filters),
+              'avg_std_time_on_traffic': engine.avg_std_time_on_traffic(*filters),
+              'avg_std_time_graph': engine.avg_std_time_graph(*filters),
+              'distance': engine.distance(*filters)}
+    for table_name, df_aux in tables.items():
+        assert 'Semi-Urban' not in set(df_aux['City'])
+        assert not any(isinstance(dtype, pd.CategoricalDtype) for dtype in df_aux.dtypes)
+        getattr(figures, table_name)(df_aux)
+
+    figures.traffic_order_share(engine.traffic_order_share(*filters))
+    figures.order_by_week(engine.order_by_week(*filters))
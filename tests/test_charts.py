@@ -0,0 +1,59 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.charts import downsample, lttb
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture
+def series():
+    """
+        Série suave com um pico e um vale isolados, que precisam sobreviver à redução.
+    """
+    rng = np.random.default_rng(5)
+    x = np.arange(10000, dtype='float64')
+    y = np.sin(x / 300) + rng.normal(0, 0.05, len(x))
+    y[3217], y[7781] = 25.0, -25.0
+
+    return x, y
+
+# ==========================
+#        Tests
+# ==========================
+
+@pytest.mark.parametrize('n_out', [3, 10, 500, 2000])
+def test_lttb_keeps_the_ends_and_the_size(series, n_out):
+    x, y = series
+    positions = lttb(x, y, n_out)
+
+    assert len(positions) == n_out
+    assert positions[0] == 0 and positions[-1] == len(x) - 1
+    assert np.all(np.diff(positions) > 0)
+
+@pytest.mark.parametrize('n_out', [10, 500, 2000])
+def test_lttb_keeps_the_extremes(series, n_out):
+    x, y = series
+    positions = lttb(x, y, n_out)
+
+    assert np.argmax(y) in positions and np.argmin(y) in positions
+
+def test_lttb_keeps_short_series(series):
+    x, y = series
+    np.testing.assert_array_equal(lttb(x[:100], y[:100], 500), np.arange(100))
+
+def test_downsample_limits_the_points(series):
+    x, y = series
+    df_aux = pd.DataFrame({'Order_Date': pd.Timestamp(2022, 2, 11) + pd.to_timedelta(x, unit='min'), 'orders': y})
+
+    df_small = downsample(df_aux, 'Order_Date', 'orders', max_points=300)
+    assert len(df_small) == 300
+    assert df_small['orders'].max() == df_aux['orders'].max()
+    assert df_small['Order_Date'].iloc[[0, -1]].tolist() == df_aux['Order_Date'].iloc[[0, -1]].tolist()
+    assert downsample(df_aux, 'Order_Date', 'orders', max_points=len(df_aux)) is df_aux
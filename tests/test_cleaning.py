@@ -0,0 +1,111 @@
+# ==========================
+#         Import's
+# ==========================
+
+import io
+import warnings
+
+import pandas as pd
+
+from analytics.cleaning import clean_code
+from benchmarks.generate import generate_chunk
+
+# ==========================
+#        Function's
+# ==========================
+
+def legacy_clean_code(df1):
+    """
+        Esta função é a limpeza original das páginas (antes da versão vetorizada),
+        mantida aqui apenas como referência do resultado esperado.
+    """
+    # removendo NaN
+    selected = (df1['Delivery_person_Age'] != 'NaN ')
+    df1 = df1.loc[selected, :]
+    selected = (df1['Road_traffic_density'] != 'NaN ')
+    df1 = df1.loc[selected, :]
+    selected = (df1['City'] != 'NaN ')
+    df1 = df1.loc[selected, :]
+    selected = (df1['Festival'] != 'NaN ')
+    df1 = df1.loc[selected, :]
+
+    # conversão string para inteiro
+    df1['Delivery_person_Age'] = df1['Delivery_person_Age'].astype(int)
+
+    # conversão string para float
+    df1['Delivery_person_Ratings'] = df1['Delivery_person_Ratings'].astype(float)
+
+    # conversão string para data
+    df1['Order_Date'] = pd.to_datetime(df1['Order_Date'], format='%d-%m-%Y')
+
+    # conversão string para inteiro
+    selected = (df1['multiple_deliveries'] != 'NaN ')
+    df1 = df1.loc[selected, :]
+    df1['multiple_deliveries'] = df1['multiple_deliveries'].astype(int)
+
+    # removendo os espaços da coluna ID
+    df1.loc[:, 'ID'] = df1.loc[:, 'ID'].str.strip()
+    df1.loc[:, 'Weatherconditions'] = df1.loc[:, 'Weatherconditions'].str.strip()
+    df1.loc[:, 'Road_traffic_density'] = df1.loc[:, 'Road_traffic_density'].str.strip()
+    df1.loc[:, 'Type_of_order'] = df1.loc[:, 'Type_of_order'].str.strip()
+    df1.loc[:, 'Type_of_vehicle'] = df1.loc[:, 'Type_of_vehicle'].str.strip()
+    df1.loc[:, 'City'] = df1.loc[:, 'City'].str.strip()
+    df1.loc[:, 'Festival'] = df1.loc[:, 'Festival'].str.strip()
+
+    # limpando a coluna time taken
+    df1['Time_taken(min)'] = df1['Time_taken(min)'].apply(lambda x: x.split('(min) ')[1])
+    df1['Time_taken(min)'] = df1['Time_taken(min)'].astype(int)
+
+    return df1
+
+def _raw(df):
+    """
+        Esta função tem a responsabilidade de passar o dataframe por um csv, como
+        na leitura do train.csv (colunas com 'NaN ' chegam como texto).
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+
+    return pd.read_csv(buffer)
+
+def _assert_same_as_legacy(raw):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = legacy_clean_code(raw.copy())
+    pd.testing.assert_frame_equal(clean_code(raw.copy()), expected)
+
+# ==========================
+#        Tests
+# ==========================
+
+def test_clean_code_matches_legacy_on_raw_quirks():
+    raw = _raw(pd.DataFrame({
+        'ID': ['0x4607 ', '0xb379 ', '0x5d6d ', '0x7a6a ', '0x70a2 ', '0x9bb4 '],
+        'Delivery_person_ID': ['INDORES13DEL02 ', 'BANGRES18DEL02 ', 'BANGRES19DEL01 ',
+                               'COIMBRES13DEL02 ', 'CHENRES12DEL01 ', 'HYDRES09DEL03 '],
+        'Delivery_person_Age': ['37', '34', 'NaN ', '38', '32', '22'],
+        'Delivery_person_Ratings': ['4.9', '4.5', 'NaN ', '4.7', '4.6', '4.8'],
+        'Restaurant_latitude': [22.745049, 12.913041, 12.914264, 11.003669, 12.972793, 17.431668],
+        'Restaurant_longitude': [75.892471, 77.683237, 77.6784, 76.976494, 80.249982, 78.408321],
+        'Delivery_location_latitude': [22.765049, 13.043041, 12.924264, 11.053669, 13.012793, 17.461668],
+        'Delivery_location_longitude': [75.912471, 77.813237, 77.6884, 77.026494, 80.289982, 78.438321],
+        'Order_Date': ['19-03-2022', '25-03-2022', '19-03-2022', '05-04-2022', '26-03-2022', '11-03-2022'],
+        'Time_Orderd': ['11:30:00', '19:45:00', '08:30:00', '18:00:00', '13:35:00', '21:20:00'],
+        'Time_Order_picked': ['11:45:00', '19:50:00', '08:45:00', '18:10:00', '13:40:00', '21:30:00'],
+        'Weatherconditions': ['conditions Sunny', 'conditions Stormy', 'conditions Sandstorms',
+                              'conditions Sunny', 'conditions NaN', 'conditions Fog'],
+        'Road_traffic_density': ['High ', 'Jam ', 'Low ', 'Medium ', 'NaN ', 'Jam '],
+        'Vehicle_condition': [2, 2, 0, 0, 1, 1],
+        'Type_of_order': ['Snack ', 'Snack ', 'Drinks ', 'Buffet ', 'Snack ', 'Meal '],
+        'Type_of_vehicle': ['motorcycle ', 'scooter ', 'motorcycle ', 'motorcycle ', 'scooter ', 'bicycle '],
+        'multiple_deliveries': ['0', '1', '1', '1', '1', 'NaN '],
+        'Festival': ['No ', 'No ', 'No ', 'No ', 'No ', 'Yes '],
+        'City': ['Urban ', 'Metropolitian ', 'Urban ', 'Metropolitian ', 'Metropolitian ', 'Semi-Urban '],
+        'Time_taken(min)': ['(min) 24', '(min) 33', '(min) 26', '(min) 21', '(min) 30', '(min) 40'],
+    }))
+
+    _assert_same_as_legacy(raw)
+
+def test_clean_code_matches_legacy_on_synthetic_export():
+    _assert_same_as_legacy(_raw(generate_chunk(5000, seed=7)))
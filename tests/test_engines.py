@@ -0,0 +1,115 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import config
+from analytics.engines import get_engine
+from analytics.loader import load_sketches
+from benchmarks.engines import FILTERS, TABLES, same_result
+from benchmarks.generate import generate_chunk
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture(scope='module')
+def dataset(tmp_path_factory):
+    path = tmp_path_factory.mktemp('dataset') / 'train.csv'
+    generate_chunk(2000, seed=5).to_csv(path, index=False)
+
+    return str(path)
+
+# ==========================
+#        Tests
+# ==========================
+
+@pytest.mark.parametrize('name', ['duckdb', 'polars', 'materialized'])
+@pytest.mark.parametrize('table', TABLES)
+def test_tables_match_pandas(dataset, name, table, monkeypatch):
+    if name in ('duckdb', 'polars'):
+        pytest.importorskip(name)
+    monkeypatch.setattr(config, 'DISTINCT_MODE', 'exact')
+    engine = get_engine(dataset, name)
+    engine.load()
+    reference = get_engine(dataset, 'pandas')
+
+    for filters in FILTERS:
+        assert same_result(getattr(reference, table)(*filters), getattr(engine, table)(*filters))
+
+def test_rank_couriers_breaks_ties_by_courier(dataset):
+    engine = get_engine(dataset, 'pandas')
+    fastest, slowest = engine.rank_couriers(*FILTERS[0])
+
+    for df_aux, ascending in [(fastest, True), (slowest, False)]:
+        expected = df_aux.sort_values(['City', 'Time_taken(min)', 'Delivery_person_ID'],
+                                      ascending=[True, ascending, True]).reset_index(drop=True)
+        pd.testing.assert_frame_equal(df_aux.sort_values('City', kind='stable').reset_index(drop=True), expected)
+
+def test_order_share_by_week_hll_is_within_the_error_of_nunique(dataset, monkeypatch):
+    engine = get_engine(dataset, 'pandas')
+    monkeypatch.setattr(config, 'DISTINCT_MODE', 'exact')
+    exact = engine.order_share_by_week(*FILTERS[0])
+
+    # no modo hll as linhas do recorte não são selecionadas
+    monkeypatch.setattr(config, 'DISTINCT_MODE', 'hll')
+    monkeypatch.setattr(engine, 'rows', lambda *args: pytest.fail('rows chamado no modo hll'))
+    estimate = engine.order_share_by_week(*FILTERS[0])
+
+    assert list(estimate['week_of_year']) == list(exact['week_of_year'])
+    # até 3 erros padrão do HyperLogLog
+    error = load_sketches(dataset).relative_error
+    assert np.allclose(estimate['Delivery_person_ID'], exact['Delivery_person_ID'], rtol=3 * error, atol=0)
+
+@pytest.mark.parametrize('name', ['pandas', 'duckdb', 'polars', 'materialized'])
+def test_courier_metrics_on_empty_selection(dataset, name):
+    if name in ('duckdb', 'polars'):
+        pytest.importorskip(name)
+    engine = get_engine(dataset, name)
+    engine.load()
+
+    metrics = engine.courier_metrics(pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7), [])
+    assert metrics == {'maior_idade': None, 'menor_idade': None, 'melhor_condicao': None, 'pior_condicao': None}
+
+    metrics = engine.courier_metrics(pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7), ['Low'])
+    assert all(type(value) is int for value in metrics.values())
+    assert metrics == get_engine(dataset, 'pandas').courier_metrics(pd.Timestamp(2022, 2, 11),
+                                                                    pd.Timestamp(2022, 4, 7), ['Low'])
+
+@pytest.mark.parametrize('name', ['pandas', 'duckdb', 'polars', 'materialized'])
+@pytest.mark.parametrize('traffic_options', [['Low', 'Jam'], []])
+def test_count_matches_the_selected_rows(dataset, name, traffic_options):
+    if name in ('duckdb', 'polars'):
+        pytest.importorskip(name)
+    engine = get_engine(dataset, name)
+    engine.load()
+    filters = (pd.Timestamp(2022, 3, 1), pd.Timestamp(2022, 3, 15), traffic_options)
+
+    expected = len(get_engine(dataset, 'pandas').rows(*filters))
+    assert engine.count(*filters) == expected
+    assert traffic_options == [] or expected > 0
+
+@pytest.mark.parametrize('name', ['duckdb', 'polars', 'materialized'])
+def test_map_medians_match_pandas(dataset, name):
+    if name in ('duckdb', 'polars'):
+        pytest.importorskip(name)
+    engine = get_engine(dataset, name)
+    engine.load()
+    filters = (pd.Timestamp(2022, 2, 20), pd.Timestamp(2022, 3, 20), ['Low', 'Jam', 'High'])
+
+    keys = ['City', 'Road_traffic_density']
+    expected = get_engine(dataset, 'pandas').map_medians(*filters).sort_values(keys, ignore_index=True)
+    result = engine.map_medians(*filters).sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+def test_materialized_map_medians_on_empty_selection(dataset):
+    engine = get_engine(dataset, 'materialized')
+    engine.load()
+
+    df_aux = engine.map_medians(pd.Timestamp(2022, 3, 1), pd.Timestamp(2022, 3, 1), ['Low'])
+    assert df_aux.empty
+    assert list(df_aux.columns) == ['City', 'Road_traffic_density', 'Delivery_location_latitude',
+                                    'Delivery_location_longitude']
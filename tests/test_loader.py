@@ -0,0 +1,72 @@
+# ==========================
+#         Import's
+# ==========================
+
+import pandas as pd
+import pytest
+
+from analytics.engines import get_engine
+from analytics.loader import (_clean_csv, _read_columnar, columnar_path, dataset_fingerprint, load_dataset,
+                              stream_columnar_cache)
+from analytics.maps import country_map_html
+from benchmarks.generate import generate_chunk
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture
+def dataset(tmp_path):
+    """
+        Csv sem o parquet ao lado: a primeira carga passa pela limpeza do csv.
+    """
+    path = tmp_path / 'train.csv'
+    generate_chunk(2000, seed=13).to_csv(path, index=False)
+
+    return str(path)
+
+# ==========================
+#        Function's
+# ==========================
+
+def render_point_maps(path):
+    """
+        Esta função tem a responsabilidade de gerar os mapas de restaurantes e
+        pedidos, que recortam linhas do dataset em cache.
+    """
+    engine = get_engine(path, 'pandas')
+    engine.load()
+    for level in ['orders', 'restaurants']:
+        country_map_html(engine, dataset_fingerprint(path), pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7),
+                         ['Low', 'Jam'], level, False)
+
+def assert_read_only(path):
+    df1 = load_dataset(path)
+    with pytest.raises(ValueError):
+        df1.loc[0, 'Delivery_person_Ratings'] = 0.0
+    with pytest.raises(ValueError):
+        df1['Time_taken(min)'].to_numpy()[0] = 0
+
+    # colunas novas continuam permitidas e não chegam ao cache
+    df1['extra'] = 1
+    assert 'extra' not in load_dataset(path).columns
+
+# ==========================
+#        Tests
+# ==========================
+
+def test_cached_dataset_is_read_only(dataset):
+    assert_read_only(dataset)
+
+def test_cached_dataset_stays_read_only_after_a_map_render(dataset):
+    load_dataset(dataset)
+    render_point_maps(dataset)
+
+    assert_read_only(dataset)
+
+def test_streamed_columnar_cache_matches_the_full_conversion(dataset):
+    pq = pytest.importorskip('pyarrow.parquet')
+    stream_columnar_cache(dataset, chunksize=300)
+
+    assert pq.ParquetFile(columnar_path(dataset)).metadata.num_row_groups > 1
+    pd.testing.assert_frame_equal(_read_columnar(dataset), _clean_csv(dataset))
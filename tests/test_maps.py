@@ -0,0 +1,89 @@
+# ==========================
+#         Import's
+# ==========================
+
+import pandas as pd
+import pytest
+
+from analytics import config
+from analytics.cleaning import clean_code, compact_schema
+from analytics.geo import add_distance
+from analytics.engines import get_engine
+from analytics.index import OrderIndex
+from analytics.loader import dataset_fingerprint, load_dataset, load_index, load_spatial_index
+from analytics.maps import HtmlCache, country_map_html, map_points
+from analytics.shared import mapped_arrays
+from analytics.spatial import GridIndex
+from benchmarks.generate import generate_chunk
+
+# ==========================
+#        Tests
+# ==========================
+
+def test_html_cache_drops_least_recently_used_over_the_limit():
+    cache = HtmlCache(max_bytes=10)
+    cache.put('a', 'x' * 4)
+    cache.put('b', 'x' * 4)
+    assert cache.get('a') is not None
+
+    cache.put('c', 'x' * 4)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size == 8
+
+    # maior que o limite: devolvido, mas não guardado
+    assert cache.put('d', 'x' * 11) == 'x' * 11
+    assert cache.get('d') is None and cache.size == 8
+
+def test_point_levels_are_capped(monkeypatch):
+    monkeypatch.setattr(config, 'MAP_MAX_POINTS', 50)
+    df1 = compact_schema(add_distance(clean_code(generate_chunk(3000, seed=3))))
+
+    for level in ['restaurants', 'orders']:
+        points = map_points(df1, level)
+        assert 0 < len(points) <= 50
+        assert list(points.columns) == ['lat', 'lon', 'label']
+        assert points['label'].str.endswith('min em média').all()
+
+    small = df1.iloc[:20]
+    assert len(map_points(small, 'orders')) == 20
+
+def test_cached_grid_matches_a_grid_over_the_selection(monkeypatch):
+    monkeypatch.setattr(config, 'MAP_MAX_POINTS', 50)
+    df1 = compact_schema(add_distance(clean_code(generate_chunk(3000, seed=3))))
+    df1 = df1.sort_values('Order_Date', kind='mergesort', ignore_index=True)
+    index = OrderIndex(df1)
+    positions = index.positions(pd.Timestamp(2022, 3, 1), pd.Timestamp(2022, 3, 20), ['Low', 'Jam'])
+    selected = index.select(pd.Timestamp(2022, 3, 1), pd.Timestamp(2022, 3, 20), ['Low', 'Jam'])
+    assert (positions == selected.index.to_numpy()).all()
+
+    for level, kind in [('restaurants', 'restaurant'), ('orders', 'delivery')]:
+        expected = map_points(selected, level)
+        result = map_points(index.frame.iloc[positions], level, GridIndex(df1, kind), positions)
+        pd.testing.assert_frame_equal(result, expected)
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_point_levels_leave_the_cached_dataset_untouched(tmp_path, monkeypatch, shared):
+    monkeypatch.setattr(config, 'MAP_MAX_POINTS', 50)
+    if shared:
+        monkeypatch.setattr(config, 'SHARED_DIR', str(tmp_path / 'shm'))
+    path = str(tmp_path / 'train.csv')
+    generate_chunk(2000, seed=17).to_csv(path, index=False)
+
+    engine = get_engine(path, 'pandas')
+    engine.load()
+    fingerprint = dataset_fingerprint(path)
+    cached = load_index(path).frame
+    mapped = mapped_arrays(cached)
+    assert mapped[0] == (mapped[1] if shared else 0)
+
+    for level in ['orders', 'restaurants']:
+        country_map_html(engine, fingerprint, pd.Timestamp(2022, 2, 11), pd.Timestamp(2022, 4, 7),
+                         ['Low', 'Jam'], level, False)
+    grid = load_spatial_index(path)
+    grid.bbox(10, 30, 70, 90)
+    grid.radius(20, 80, 50)
+
+    assert mapped_arrays(cached) == mapped
+    with pytest.raises(ValueError):
+        load_dataset(path).loc[0, 'Delivery_person_Ratings'] = 0.0
@@ -0,0 +1,37 @@
+# ==========================
+#         Import's
+# ==========================
+
+import json
+import logging
+
+from analytics import profiling
+from analytics.profiling import PageProfiler
+
+# ==========================
+#        Tests
+# ==========================
+
+def test_disabled_profiler_leaves_the_logger_alone(monkeypatch):
+    monkeypatch.setattr(profiling, '_logger_ready', False)
+    monkeypatch.setattr(profiling.logger, 'handlers', [])
+    monkeypatch.setattr(profiling.logger, 'level', logging.NOTSET)
+
+    PageProfiler('visao_empresa', enabled=False).finish()
+    assert profiling.logger.handlers == [] and not profiling._logger_ready
+
+def test_profiler_logs_through_the_application_handlers(monkeypatch, caplog):
+    # o caplog fica no logger raiz, como uma configuração de logging da aplicação
+    monkeypatch.setattr(profiling, '_logger_ready', False)
+    monkeypatch.setattr(profiling.logger, 'handlers', [])
+    monkeypatch.setattr(profiling.logger, 'level', logging.NOTSET)
+
+    profiler = PageProfiler('visao_empresa', enabled=True)
+    with profiler.section('filter') as section:
+        section.rows = 10
+    line = profiler.finish()
+
+    assert profiling.logger.handlers == []
+    assert [json.loads(record.getMessage()) for record in caplog.records
+            if record.name == profiling.logger.name] == [line]
+    assert caplog.records[-1].levelno == logging.INFO
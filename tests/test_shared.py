@@ -0,0 +1,59 @@
+# ==========================
+#         Import's
+# ==========================
+
+import os
+import warnings
+
+import pytest
+
+from analytics import config
+from analytics.loader import load_index
+from analytics.shared import mapped_arrays
+from benchmarks.generate import generate_chunk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ['pages/1_visao_empresa.py', 'pages/2_visao_entregadores.py', 'pages/3_visao_restaurantes.py']
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """
+        Pasta com as páginas, o logo e um csv sintético em dataset/train.csv, com
+        o dataset publicado na pasta compartilhada (CURRY_SHARED_DIR).
+    """
+    for name in ['pages', 'logo.jpg']:
+        os.symlink(os.path.join(ROOT, name), tmp_path / name)
+    (tmp_path / 'dataset').mkdir()
+    generate_chunk(3000, seed=19).to_csv(tmp_path / 'dataset' / 'train.csv', index=False)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, 'SHARED_DIR', str(tmp_path / 'shm'))
+    monkeypatch.setattr(config, 'ENGINE', 'pandas')
+
+    return tmp_path
+
+# ==========================
+#        Tests
+# ==========================
+
+def test_pages_keep_the_shared_dataset_mapped(app_dir):
+    AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for page in PAGES:
+            at = AppTest.from_file(page, default_timeout=120).run()
+            assert not at.exception
+            if page == PAGES[0]:
+                # níveis do mapa que recortam linhas do dataset
+                for option in ['Restaurantes', 'Pedidos']:
+                    at.radio[0].set_value(option).run()
+                    assert not at.exception
+
+    mapped, total = mapped_arrays(load_index('dataset/train.csv').frame)
+    assert total > 0 and mapped == total
@@ -0,0 +1,65 @@
+# ==========================
+#         Import's
+# ==========================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.geo import haversine_km
+from analytics.spatial import GridIndex
+
+# ==========================
+#        Fixture's
+# ==========================
+
+@pytest.fixture(scope='module')
+def points():
+    """
+        Pedidos espalhados pela Índia, com parte deles concentrada em uma cidade
+        (muitas linhas na mesma célula da grade).
+    """
+    rng = np.random.default_rng(7)
+    lat = np.concatenate([rng.uniform(8, 32, 4000), rng.normal(12.97, 0.05, 2000)])
+    lon = np.concatenate([rng.uniform(68, 90, 4000), rng.normal(77.59, 0.05, 2000)])
+
+    return pd.DataFrame({'Delivery_location_latitude': lat, 'Delivery_location_longitude': lon,
+                         'Time_taken(min)': rng.integers(10, 55, len(lat))})
+
+# ==========================
+#        Tests
+# ==========================
+
+@pytest.mark.parametrize('cell_size', [0.05, 0.5])
+def test_bbox_matches_brute_force(points, cell_size):
+    index = GridIndex(points, cell_size=cell_size)
+    lat, lon = points['Delivery_location_latitude'], points['Delivery_location_longitude']
+
+    for lat_min, lat_max, lon_min, lon_max in [(12.9, 13.05, 77.5, 77.7), (10, 20, 70, 80), (8, 32, 68, 90),
+                                               (12.97, 12.97, 77.59, 77.59), (40, 50, 10, 20)]:
+        expected = np.flatnonzero((lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max))
+        np.testing.assert_array_equal(index.bbox_positions(lat_min, lat_max, lon_min, lon_max), expected)
+        pd.testing.assert_frame_equal(index.bbox(lat_min, lat_max, lon_min, lon_max), points.iloc[expected])
+
+@pytest.mark.parametrize('cell_size', [0.05, 0.5])
+@pytest.mark.parametrize('radius_km', [1, 5, 50, 400])
+def test_radius_matches_brute_force(points, cell_size, radius_km):
+    index = GridIndex(points, cell_size=cell_size)
+    lat, lon = points['Delivery_location_latitude'], points['Delivery_location_longitude']
+
+    for center_lat, center_lon in [(12.97, 77.59), (28.6, 77.2), (31.5, 89.0), (lat[0], lon[0])]:
+        distance = haversine_km(center_lat, center_lon, lat, lon)
+        expected = np.flatnonzero(distance <= radius_km)
+        np.testing.assert_array_equal(index.radius_positions(center_lat, center_lon, radius_km), expected)
+        pd.testing.assert_frame_equal(index.radius(center_lat, center_lon, radius_km), points.iloc[expected])
+
+def test_radius_far_from_the_equator():
+    # longe do equador a calota é mais larga em longitude que raio / cos(lat)
+    rng = np.random.default_rng(3)
+    lat, lon = rng.uniform(40, 89.9, 50000), rng.uniform(-60, 60, 50000)
+    index = GridIndex(pd.DataFrame({'Delivery_location_latitude': lat, 'Delivery_location_longitude': lon}),
+                      cell_size=0.5)
+
+    for center_lat, center_lon, radius_km in [(60, 10, 1500), (70, 20, 1500), (89, 5, 500)]:
+        expected = np.flatnonzero(haversine_km(center_lat, center_lon, lat, lon) <= radius_km)
+        np.testing.assert_array_equal(index.radius_positions(center_lat, center_lon, radius_km), expected)